@@ -1,14 +1,20 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from datetime import datetime, timedelta
-import time
+import asyncio
+import io
 import os
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import xxhash
 from data_fetcher import DataFetcher
 from technical_indicators import TechnicalIndicators
 from visualizations import ChartVisualizer
-from utils import format_currency, format_percentage, calculate_percentage_change
+from utils import format_currency, calculate_percentage_change, calculate_correlation_matrix
+from streamlit_autorefresh import st_autorefresh
 
 # Configure page
 st.set_page_config(
@@ -18,19 +24,81 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
-if 'last_update' not in st.session_state:
-    st.session_state.last_update = None
-if 'btc_data' not in st.session_state:
-    st.session_state.btc_data = None
-if 'historical_data' not in st.session_state:
-    st.session_state.historical_data = None
+# Figures serialized through plotly.io (as st.plotly_chart does) use orjson
+pio.json.config.default_engine = 'orjson'
 
 # Initialize classes
-data_fetcher = DataFetcher()
+@st.cache_resource(show_spinner=False)
+def _get_data_fetcher():
+    """Create the DataFetcher once per process so its cached session isn't reopened on every rerun"""
+    return DataFetcher()
+
+data_fetcher = _get_data_fetcher()
 tech_indicators = TechnicalIndicators()
 chart_viz = ChartVisualizer()
 
+# Cached data fetchers
+async def _gather(*coroutines):
+    """Run the given fetches concurrently (each in a worker thread on the cached session)"""
+    return await asyncio.gather(*coroutines, return_exceptions=True)
+
+# Large DataFrames are cached as resources (no pickling on every rerun)
+# and copied on read so callers can't mutate the shared cache entries.
+@st.cache_resource(ttl=300, show_spinner=False)
+def _cached_bitcoin(days):
+    """Fetch current and historical Bitcoin data (cached for 5 minutes)"""
+    btc_data, historical_data = asyncio.run(_gather(
+        data_fetcher.aget_current_price("bitcoin"),
+        data_fetcher.aget_historical_data("bitcoin", days)
+    ))
+    
+    for result in (btc_data, historical_data):
+        if isinstance(result, Exception):
+            raise result
+    
+    return btc_data, historical_data, datetime.now()
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def _cached_comparison(days, coins):
+    """Fetch closing prices for the comparison cryptos (cached for 5 minutes)"""
+    # Coins that fail to load are left out of the batch rather than failing it
+    (closes,) = asyncio.run(_gather(data_fetcher.aget_closes_batch(list(coins), days)))
+    
+    if isinstance(closes, Exception):
+        raise closes
+    
+    return closes
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def _cached_indicators(days, indicators, fetched_at):
+    """Calculate technical indicators for the cached Bitcoin history"""
+    # fetched_at ties the entry to the Bitcoin fetch it was computed from
+    _, historical_data, _ = _cached_bitcoin(days)
+    # The fetched frame already has float64 OHLC columns, so nothing is written back to it
+    return tech_indicators.calculate_all_indicators(historical_data, list(indicators), copy=False)
+
+def _frame_fingerprint(df):
+    """Content key for the numeric DataFrames passed to _chart_spec (xxh3 over the raw values)"""
+    values = np.ascontiguousarray(df.to_numpy())
+    return (tuple(df.columns), len(df), df.index[:1].tolist(), df.index[-1:].tolist(),
+            xxhash.xxh3_64_intdigest(values))
+
+@st.cache_data(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: _frame_fingerprint})
+def _chart_spec(method, data, *args):
+    """Build a ChartVisualizer figure once per distinct input, kept as a plain dict"""
+    return getattr(chart_viz, method)(data, *args).to_dict()
+
+def _chart(method, data, *args):
+    """Cached figure, rebuilt without re-running Plotly's validators"""
+    return go.Figure(_chart_spec(method, data, *args), _validate=False)
+
+@st.cache_data(show_spinner=False, ttl=300, max_entries=16)
+def _to_csv(df):
+    """Serialize a DataFrame (index first) to CSV bytes with PyArrow's writer"""
+    buf = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(df.reset_index(), preserve_index=False), buf)
+    return buf.getvalue()
+
 # Title and header
 st.title("₿ Bitcoin Data Analysis Dashboard")
 st.markdown("Real-time Bitcoin price tracking, technical indicators, and market analysis")
@@ -38,149 +106,79 @@ st.markdown("Real-time Bitcoin price tracking, technical indicators, and market
 # Sidebar controls
 st.sidebar.header("Dashboard Controls")
 
-# Auto-refresh toggle
-auto_refresh = st.sidebar.checkbox("Auto-refresh (every 5 minutes)", value=True)
-
 # Manual refresh button
 if st.sidebar.button("Refresh Data Now"):
-    st.session_state.last_update = None
+    _cached_bitcoin.clear()
+    _cached_comparison.clear()
 
-# Time period selection for historical data
-time_period = st.sidebar.selectbox(
-    "Historical Data Period",
-    ["7", "30", "90", "365"],
-    index=1,
-    format_func=lambda x: f"{x} days"
-)
-
-# Cryptocurrency comparison
-compare_cryptos = st.sidebar.multiselect(
-    "Compare with other cryptocurrencies",
-    ["ethereum", "cardano", "solana", "polygon", "chainlink"],
-    default=["ethereum"]
-)
-
-# Technical indicators selection
-selected_indicators = st.sidebar.multiselect(
-    "Technical Indicators",
-    ["SMA_20", "SMA_50", "EMA_12", "EMA_26", "RSI", "MACD", "Bollinger_Bands"],
-    default=["SMA_20", "SMA_50", "RSI"]
-)
+# Controls are batched in a form so changing several of them costs one rerun
+with st.sidebar.form("controls"):
+    # Auto-refresh toggle
+    auto_refresh = st.checkbox("Auto-refresh (every 5 minutes)", value=True)
+    
+    # Time period selection for historical data (labels map to API day counts)
+    period_options = {"7 days": "7", "30 days": "30", "90 days": "90", "365 days": "365"}
+    time_period = period_options[st.selectbox(
+        "Historical Data Period",
+        list(period_options),
+        index=1
+    )]
+    
+    # Cryptocurrency comparison
+    compare_cryptos = st.multiselect(
+        "Compare with other cryptocurrencies",
+        ["ethereum", "cardano", "solana", "polygon", "chainlink"],
+        default=["ethereum"]
+    )
+    
+    # Technical indicators selection
+    selected_indicators = st.multiselect(
+        "Technical Indicators",
+        ["SMA_20", "SMA_50", "EMA_12", "EMA_26", "RSI", "MACD", "Bollinger_Bands"],
+        default=["SMA_20", "SMA_50", "RSI"]
+    )
+    
+    st.form_submit_button("Apply")
 
 # Data fetching logic
 def fetch_data():
-    """Fetch and cache data"""
-    current_time = datetime.now()
+    """Fetch data through the TTL caches"""
+    with st.spinner("Fetching latest Bitcoin data..."):
+        try:
+            btc_data, historical_data, last_update = _cached_bitcoin(time_period)
+            comparison_closes = _cached_comparison(time_period, tuple(compare_cryptos))
+        except Exception as e:
+            st.sidebar.error(f"Error fetching data: {str(e)}")
+            return None
     
-    # Check if we need to update data (5 minutes interval for auto-refresh)
-    if (st.session_state.last_update is None or 
-        (current_time - st.session_state.last_update).total_seconds() > 300):
-        
-        with st.spinner("Fetching latest Bitcoin data..."):
-            try:
-                # Fetch current Bitcoin data
-                btc_data = data_fetcher.get_current_price("bitcoin")
-                
-                # Fetch historical data
-                historical_data = data_fetcher.get_historical_data("bitcoin", time_period)
-                
-                # Fetch comparison data
-                comparison_data = {}
-                for crypto in compare_cryptos:
-                    comparison_data[crypto] = data_fetcher.get_historical_data(crypto, time_period)
-                
-                # Update session state
-                st.session_state.btc_data = btc_data
-                st.session_state.historical_data = historical_data
-                st.session_state.comparison_data = comparison_data
-                st.session_state.last_update = current_time
-                
-                st.sidebar.success(f"Data updated at {current_time.strftime('%H:%M:%S')}")
-                
-            except Exception as e:
-                st.sidebar.error(f"Error fetching data: {str(e)}")
-                return False
-    
-    return True
+    return dict(btc_data), historical_data.copy(), comparison_closes.copy(), last_update
 
 # Fetch data
-if fetch_data():
-    btc_data = st.session_state.btc_data
-    historical_data = st.session_state.historical_data
-    comparison_data = st.session_state.comparison_data
+fetched = fetch_data()
+if fetched:
+    btc_data, historical_data, comparison_closes, last_update = fetched
     
     if btc_data and historical_data is not None:
         # Key metrics section
         st.header("📊 Key Metrics")
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                "Current Price",
-                format_currency(btc_data['current_price']),
-                delta=f"{format_percentage(btc_data['price_change_percentage_24h'])}%"
-            )
-        
-        with col2:
-            st.metric(
-                "Market Cap",
-                format_currency(btc_data['market_cap']),
-                delta=f"{format_percentage(btc_data['market_cap_change_percentage_24h'])}%"
-            )
-        
-        with col3:
-            st.metric(
-                "24h Volume",
-                format_currency(btc_data['total_volume'])
-            )
-        
-        with col4:
-            st.metric(
-                "24h High/Low",
-                f"{format_currency(btc_data['high_24h'])} / {format_currency(btc_data['low_24h'])}"
-            )
-        
-        # Additional metrics
-        col5, col6, col7, col8 = st.columns(4)
-        
-        with col5:
-            st.metric(
-                "Circulating Supply",
-                f"{btc_data['circulating_supply']:,.0f} BTC"
-            )
-        
-        with col6:
-            st.metric(
-                "Total Supply",
-                f"{btc_data.get('total_supply', 21000000):,.0f} BTC"
-            )
-        
-        with col7:
-            st.metric(
-                "Market Cap Rank",
-                f"#{btc_data['market_cap_rank']}"
-            )
-        
-        with col8:
-            ath_change = ((btc_data['current_price'] - btc_data['ath']) / btc_data['ath']) * 100
-            st.metric(
-                "All-Time High",
-                format_currency(btc_data['ath']),
-                delta=f"{ath_change:.1f}%"
-            )
+        # All eight metrics render as one figure (one payload instead of eight widgets)
+        metrics_fig = _chart('create_key_metrics_chart', btc_data)
+        st.plotly_chart(metrics_fig, use_container_width=True)
         
         # Price chart section
         st.header("📈 Price Chart & Technical Analysis")
         
         # Calculate technical indicators
-        df_with_indicators = tech_indicators.calculate_all_indicators(
-            historical_data, 
-            selected_indicators
-        )
+        # Sorted so reordering the multiselect hits the same cache entry
+        df_with_indicators = _cached_indicators(
+            time_period,
+            tuple(sorted(selected_indicators)),
+            last_update
+        ).copy()
         
         # Create main price chart
-        fig = chart_viz.create_price_chart(df_with_indicators, selected_indicators)
+        fig = _chart('create_price_chart', df_with_indicators, tuple(selected_indicators))
         st.plotly_chart(fig, use_container_width=True)
         
         # Technical indicators dashboard
@@ -192,65 +190,58 @@ if fetch_data():
             col_idx = 0
             if "RSI" in selected_indicators:
                 with indicator_cols[col_idx]:
-                    rsi_fig = chart_viz.create_rsi_chart(df_with_indicators)
+                    rsi_fig = _chart('create_rsi_chart', df_with_indicators)
                     st.plotly_chart(rsi_fig, use_container_width=True)
                     col_idx += 1
             
             if "MACD" in selected_indicators:
                 with indicator_cols[col_idx]:
-                    macd_fig = chart_viz.create_macd_chart(df_with_indicators)
+                    macd_fig = _chart('create_macd_chart', df_with_indicators)
                     st.plotly_chart(macd_fig, use_container_width=True)
         
         # Correlation analysis
-        if compare_cryptos and comparison_data:
+        if compare_cryptos and not comparison_closes.empty:
             st.header("🔗 Cryptocurrency Correlation Analysis")
             
-            # Create correlation matrix
-            correlation_df = pd.DataFrame()
-            correlation_df['Bitcoin'] = historical_data['price']
-            
-            for crypto in compare_cryptos:
-                if crypto in comparison_data and comparison_data[crypto] is not None:
-                    crypto_data = comparison_data[crypto]
-                    if len(crypto_data) == len(historical_data):
-                        correlation_df[crypto.title()] = crypto_data['price']
+            # Create correlation matrix (built in one concat, aligned on the Bitcoin index)
+            aligned = comparison_closes.columns[comparison_closes.count() == len(historical_data)]
+            correlation_df = pd.concat(
+                [historical_data['price'].rename('Bitcoin'), comparison_closes[aligned].rename(columns=str.title)],
+                axis=1
+            ).reindex(historical_data.index)
             
             if len(correlation_df.columns) > 1:
-                # Calculate correlation matrix
-                corr_matrix = correlation_df.corr()
+                # Calculate correlation matrix (float32 is ample for display)
+                corr_matrix = calculate_correlation_matrix(correlation_df, dtype=np.float32)
                 
-                # Create heatmap
-                fig_corr = px.imshow(
-                    corr_matrix,
-                    text_auto=True,
-                    aspect="auto",
-                    title="Cryptocurrency Price Correlation Matrix",
-                    color_continuous_scale="RdBu_r"
-                )
+                fig_corr = _chart('create_correlation_heatmap', corr_matrix)
                 st.plotly_chart(fig_corr, use_container_width=True)
                 
                 # Price comparison chart
-                fig_comparison = go.Figure()
+                # Normalize all prices to percentage change in one broadcast
+                base = correlation_df.iloc[0].to_numpy(dtype=np.float32)
+                normalized = (correlation_df.to_numpy(dtype=np.float32) / base - 1.0) * 100.0
                 
-                for column in correlation_df.columns:
-                    # Normalize prices to percentage change
-                    normalized_prices = ((correlation_df[column] / correlation_df[column].iloc[0]) - 1) * 100
-                    fig_comparison.add_trace(
-                        go.Scatter(
-                            x=historical_data.index,
-                            y=normalized_prices,
-                            mode='lines',
-                            name=column,
-                            line=dict(width=2)
-                        )
+                # Build every trace up front and construct the figure once
+                traces = [
+                    go.Scattergl(
+                        x=historical_data.index,
+                        y=normalized[:, i],
+                        mode='lines',
+                        name=column,
+                        line=dict(width=2)
+                    )
+                    for i, column in enumerate(correlation_df.columns)
+                ]
+                fig_comparison = go.Figure(
+                    data=traces,
+                    layout=go.Layout(
+                        title="Normalized Price Comparison (% Change)",
+                        xaxis_title="Date",
+                        yaxis_title="Percentage Change (%)",
+                        hovermode='x unified',
+                        height=400
                     )
-                
-                fig_comparison.update_layout(
-                    title="Normalized Price Comparison (% Change)",
-                    xaxis_title="Date",
-                    yaxis_title="Percentage Change (%)",
-                    hovermode='x unified',
-                    height=400
                 )
                 
                 st.plotly_chart(fig_comparison, use_container_width=True)
@@ -262,20 +253,18 @@ if fetch_data():
         
         with col1:
             # Export historical data
-            csv_historical = historical_data.to_csv()
             st.download_button(
                 label="Download Historical Data (CSV)",
-                data=csv_historical,
+                data=_to_csv(historical_data),
                 file_name=f"bitcoin_historical_data_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
         
         with col2:
             # Export technical indicators
-            csv_indicators = df_with_indicators.to_csv()
             st.download_button(
                 label="Download Technical Indicators (CSV)",
-                data=csv_indicators,
+                data=_to_csv(df_with_indicators),
                 file_name=f"bitcoin_technical_indicators_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
@@ -334,23 +323,24 @@ if fetch_data():
         with col2:
             st.subheader("Technical Summary")
             
-            latest_data = df_with_indicators.iloc[-1]
-            current_price = latest_data['close']
+            # Plain dict lookups instead of per-key pandas indexing
+            latest_values = df_with_indicators.iloc[-1].to_dict()
+            current_price = latest_values['close']
             
             summary_items = []
             
-            if 'SMA_20' in df_with_indicators.columns:
-                sma_20 = latest_data['SMA_20']
+            if 'SMA_20' in latest_values:
+                sma_20 = latest_values['SMA_20']
                 sma_trend = "Above" if current_price > sma_20 else "Below"
                 summary_items.append(f"Price is {sma_trend} 20-day SMA")
             
-            if 'SMA_50' in df_with_indicators.columns:
-                sma_50 = latest_data['SMA_50']
+            if 'SMA_50' in latest_values:
+                sma_50 = latest_values['SMA_50']
                 sma_trend = "Above" if current_price > sma_50 else "Below"
                 summary_items.append(f"Price is {sma_trend} 50-day SMA")
             
-            if 'RSI' in df_with_indicators.columns:
-                rsi = latest_data['RSI']
+            if 'RSI' in latest_values:
+                rsi = latest_values['RSI']
                 if rsi > 70:
                     rsi_status = "Overbought"
                 elif rsi < 30:
@@ -367,11 +357,10 @@ if fetch_data():
 
 # Auto-refresh logic
 if auto_refresh:
-    time.sleep(1)  # Small delay to prevent excessive API calls
-    st.rerun()
+    st_autorefresh(interval=300_000, key="auto")
 
 # Footer
 st.markdown("---")
 st.markdown("**Data provided by CoinGecko API** | **Built with Streamlit**")
-if st.session_state.last_update:
-    st.caption(f"Last updated: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')}")
+if fetched:
+    st.caption(f"Last updated: {last_update.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -1,18 +1,142 @@
+import asyncio
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
+import orjson
 import os
 from datetime import datetime, timedelta
 import time
 
+# Retry policy of the session adapter
+_RETRIES = 3
+_BACKOFF = 0.3
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 class DataFetcher:
     """Class to handle cryptocurrency data fetching from CoinGecko API"""
     
     def __init__(self):
         self.base_url = "https://api.coingecko.com/api/v3"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Bitcoin-Analysis-App/1.0'
-        })
+        self.headers = {
+            'User-Agent': 'Bitcoin-Analysis-App/1.0',
+            'Accept-Encoding': 'gzip, deflate'
+        }
+        # Responses are cached on disk for 5 minutes (SQLite, survives restarts)
+        self.session = requests_cache.CachedSession(
+            '.cg_cache',
+            expire_after=300,
+            allowable_methods=('GET',),
+            stale_if_error=True
+        )
+        self.session.headers.update(self.headers)
+        
+        # Keep-alive pool sized for concurrent fetches, retrying rate limits and server errors
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=_RETRIES, backoff_factor=_BACKOFF, status_forcelist=list(_RETRY_STATUSES))
+        )
+        self.session.mount('https://', adapter)
+    
+    async def _aget_json(self, url, params):
+        """
+        GET a URL through the cached session in a worker thread and decode the JSON body
+        
+        The async fetchers share the sync session so they get the same on-disk
+        cache, stale-if-error fallback and adapter retries (rate limits, server
+        errors and connection failures, honouring Retry-After).
+        
+        Args:
+            url (str): Request URL
+            params (dict): Query parameters
+            
+        Returns:
+            Decoded JSON response
+        """
+        def fetch():
+            response = self.session.get(url, params=params, timeout=15)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        
+        return await asyncio.to_thread(fetch)
+    
+    def _current_price_params(self):
+        """Query parameters for the /coins/{id} endpoint"""
+        return {
+            'localization': 'false',
+            'tickers': 'false',
+            'community_data': 'false',
+            'developer_data': 'false',
+            'sparkline': 'false'
+        }
+    
+    def _parse_current_price(self, data):
+        """
+        Extract the relevant market data from a /coins/{id} response
+        
+        Args:
+            data (dict): Decoded API response
+            
+        Returns:
+            dict: Current price and market data
+        """
+        market_data = data['market_data']
+        
+        return {
+            'current_price': market_data['current_price']['usd'],
+            'market_cap': market_data['market_cap']['usd'],
+            'market_cap_rank': data['market_cap_rank'],
+            'total_volume': market_data['total_volume']['usd'],
+            'high_24h': market_data['high_24h']['usd'],
+            'low_24h': market_data['low_24h']['usd'],
+            'price_change_24h': market_data['price_change_24h'],
+            'price_change_percentage_24h': market_data['price_change_percentage_24h'],
+            'price_change_percentage_7d': market_data.get('price_change_percentage_7d', 0),
+            'price_change_percentage_30d': market_data.get('price_change_percentage_30d', 0),
+            'market_cap_change_24h': market_data['market_cap_change_24h'],
+            'market_cap_change_percentage_24h': market_data['market_cap_change_percentage_24h'],
+            'circulating_supply': market_data['circulating_supply'],
+            'total_supply': market_data.get('total_supply'),
+            'max_supply': market_data.get('max_supply'),
+            'ath': market_data['ath']['usd'],
+            'ath_change_percentage': market_data['ath_change_percentage']['usd'],
+            'ath_date': market_data['ath_date']['usd'],
+            'atl': market_data['atl']['usd'],
+            'atl_change_percentage': market_data['atl_change_percentage']['usd'],
+            'atl_date': market_data['atl_date']['usd'],
+            'last_updated': data['last_updated']
+        }
+    
+    def _parse_historical_data(self, data):
+        """
+        Convert a /coins/{id}/ohlc response into a DataFrame
+        
+        Args:
+            data (list): Decoded API response ([timestamp, open, high, low, close] rows)
+            
+        Returns:
+            pandas.DataFrame: Historical price data with OHLCV
+        """
+        if not data:
+            raise Exception("No historical data returned from API")
+        
+        # Convert to a float64 array in one pass (missing values become NaN)
+        arr = np.asarray(data, dtype=np.float64)
+        
+        # Millisecond timestamps map directly onto datetime64[ms]
+        index = pd.DatetimeIndex(arr[:, 0].astype(np.int64).view('datetime64[ms]'), name='timestamp')
+        df = pd.DataFrame(arr[:, 1:], index=index, columns=['open', 'high', 'low', 'close'])
+        
+        # Add a price column (using close price)
+        df['price'] = df['close']
+        
+        # Forward fill any NaN values
+        df.ffill(inplace=True)
+        
+        return df
         
     def get_current_price(self, coin_id="bitcoin"):
         """
@@ -26,46 +150,14 @@ class DataFetcher:
         """
         try:
             url = f"{self.base_url}/coins/{coin_id}"
-            params = {
-                'localization': 'false',
-                'tickers': 'false',
-                'community_data': 'false',
-                'developer_data': 'false',
-                'sparkline': 'false'
-            }
+            params = self._current_price_params()
             
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            
-            # Extract relevant market data
-            market_data = data['market_data']
-            
-            return {
-                'current_price': market_data['current_price']['usd'],
-                'market_cap': market_data['market_cap']['usd'],
-                'market_cap_rank': data['market_cap_rank'],
-                'total_volume': market_data['total_volume']['usd'],
-                'high_24h': market_data['high_24h']['usd'],
-                'low_24h': market_data['low_24h']['usd'],
-                'price_change_24h': market_data['price_change_24h'],
-                'price_change_percentage_24h': market_data['price_change_percentage_24h'],
-                'price_change_percentage_7d': market_data.get('price_change_percentage_7d', 0),
-                'price_change_percentage_30d': market_data.get('price_change_percentage_30d', 0),
-                'market_cap_change_24h': market_data['market_cap_change_24h'],
-                'market_cap_change_percentage_24h': market_data['market_cap_change_percentage_24h'],
-                'circulating_supply': market_data['circulating_supply'],
-                'total_supply': market_data.get('total_supply'),
-                'max_supply': market_data.get('max_supply'),
-                'ath': market_data['ath']['usd'],
-                'ath_change_percentage': market_data['ath_change_percentage']['usd'],
-                'ath_date': market_data['ath_date']['usd'],
-                'atl': market_data['atl']['usd'],
-                'atl_change_percentage': market_data['atl_change_percentage']['usd'],
-                'atl_date': market_data['atl_date']['usd'],
-                'last_updated': data['last_updated']
-            }
+            data = orjson.loads(response.content)
+            
+            return self._parse_current_price(data)
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"API request failed: {str(e)}")
@@ -95,36 +187,104 @@ class DataFetcher:
             response = self.session.get(url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
-            if not data:
-                raise Exception("No historical data returned from API")
+            return self._parse_historical_data(data)
             
-            # Convert to DataFrame
-            df = pd.DataFrame(data, columns=['timestamp', 'open', 'high', 'low', 'close'])
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"API request failed: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error fetching historical data: {str(e)}")
+    
+    async def aget_current_price(self, coin_id="bitcoin"):
+        """
+        Asynchronously fetch current price and market data for a cryptocurrency
+        
+        Args:
+            coin_id (str): CoinGecko coin ID
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+        Returns:
+            dict: Current price and market data
+        """
+        try:
+            url = f"{self.base_url}/coins/{coin_id}"
+            data = await self._aget_json(url, self._current_price_params())
             
-            # Ensure all price columns are numeric
-            price_columns = ['open', 'high', 'low', 'close']
-            for col in price_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            return self._parse_current_price(data)
             
-            # Add a price column (using close price)
-            df['price'] = df['close']
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"API request failed: {str(e)}")
+        except KeyError as e:
+            raise Exception(f"Unexpected API response format: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error fetching current price data: {str(e)}")
+    
+    async def aget_historical_data(self, coin_id="bitcoin", days="30"):
+        """
+        Asynchronously fetch historical price data for a cryptocurrency
+        
+        Args:
+            coin_id (str): CoinGecko coin ID
+            days (str): Number of days of historical data
             
-            # Forward fill any NaN values
-            df.fillna(method='ffill', inplace=True)
+        Returns:
+            pandas.DataFrame: Historical price data with OHLCV
+        """
+        try:
+            url = f"{self.base_url}/coins/{coin_id}/ohlc"
+            params = {
+                'vs_currency': 'usd',
+                'days': days
+            }
+            data = await self._aget_json(url, params)
             
-            return df
+            return self._parse_historical_data(data)
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"API request failed: {str(e)}")
         except Exception as e:
             raise Exception(f"Error fetching historical data: {str(e)}")
     
+    async def aget_closes_batch(self, coin_ids, days="30"):
+        """
+        Asynchronously fetch closing prices for several cryptocurrencies at once
+        
+        Args:
+            coin_ids (list): List of CoinGecko coin IDs
+            days (str): Number of days of historical data
+            
+        Returns:
+            pandas.DataFrame: Close prices, one column per coin (coins that fail to load are left out)
+        """
+        results = await asyncio.gather(
+            *(self.aget_historical_data(coin_id, days) for coin_id in coin_ids),
+            return_exceptions=True
+        )
+        
+        closes = {
+            coin_id: result['close']
+            for coin_id, result in zip(coin_ids, results)
+            if not isinstance(result, Exception)
+        }
+        
+        if not closes:
+            return pd.DataFrame()
+        
+        return pd.concat(closes, axis=1)
+    
+    def get_closes_batch(self, coin_ids, days="30"):
+        """
+        Fetch closing prices for several cryptocurrencies at once
+        
+        Args:
+            coin_ids (list): List of CoinGecko coin IDs
+            days (str): Number of days of historical data
+            
+        Returns:
+            pandas.DataFrame: Close prices, one column per coin (coins that fail to load are left out)
+        """
+        return asyncio.run(self.aget_closes_batch(coin_ids, days))
+    
     def get_simple_price(self, coin_ids, vs_currency="usd"):
         """
         Fetch simple price data for multiple cryptocurrencies
@@ -149,7 +309,7 @@ class DataFetcher:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            return response.json()
+            return orjson.loads(response.content)
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"API request failed: {str(e)}")
@@ -178,7 +338,7 @@ class DataFetcher:
             response = self.session.get(url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Convert to more usable format
             prices_df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
@@ -1,11 +1,253 @@
 import pandas as pd
 import numpy as np
+from collections import deque
+from numba import njit, types
+
+try:
+    import bottleneck as bn
+except ImportError:  # fall back to pandas rolling (see TechnicalIndicators._rolling)
+    bn = None
+
+try:
+    import polars as pl
+except ImportError:  # optional backend for very large frames
+    pl = None
+
+# From this many rows calculate_all_indicators hands off to the Polars backend
+POLARS_ROW_THRESHOLD = 500_000
+
+# fastmath flags minus nnan/ninf, so the NaN checks in the kernels survive
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# Explicit signatures compile the kernels eagerly (or load them from the
+# on-disk cache) at import, for both the float64 and float32 precisions. The
+# inputs are typed read-only so that both writable arrays and the read-only
+# ones Series.to_numpy() returns under Copy-on-Write match
+_INPUTS = [types.Array(dtype, 1, 'A', readonly=True) for dtype in (types.float64, types.float32)]
+_EMA_SIGNATURES = [types.Array(x.dtype, 1, 'A')(x, types.float64) for x in _INPUTS]
+_MACD_SIGNATURES = [
+    types.UniTuple(types.Array(x.dtype, 1, 'A'), 5)(x, types.float64, types.float64, types.float64)
+    for x in _INPUTS
+]
+_RSI_SIGNATURES = [types.Array(x.dtype, 1, 'A')(x, types.int64) for x in _INPUTS]
+
+@njit('UniTuple(float64, 2)(float64, float64, float64, float64, float64)', cache=True, fastmath=_FASTMATH)
+def _ema_step(s, decay, v, alpha, beta):
+    """
+    Advance one EMA state by one observation (pandas ewm, adjust=False)
+    
+    Args:
+        s (float): Current EMA value (NaN until the first observation)
+        decay (float): Weight decay accumulated over skipped NaN observations
+        v (float): New observation
+        alpha (float): Smoothing factor
+        beta (float): 1 - alpha
+        
+    Returns:
+        tuple: (EMA value, decay)
+    """
+    if np.isnan(v):
+        if not np.isnan(s):
+            decay *= beta
+    elif np.isnan(s):
+        s = v
+    elif decay == 1.0:
+        # alpha * v is off the dependency chain, so with 'contract' each step
+        # costs a single fused multiply-add on s
+        s = alpha * v + beta * s
+    else:
+        # Gaps keep decaying the old value, as pandas does with ignore_na=False
+        w = decay * beta
+        s = (w * s + alpha * v) / (w + alpha)
+        decay = 1.0
+    return s, decay
+
+@njit(_EMA_SIGNATURES, cache=True, fastmath=_FASTMATH)
+def _ema_kernel(x, alpha):
+    """
+    Exponential moving average (pandas ewm with adjust=False) in one pass
+    
+    Args:
+        x (numpy.ndarray): Price data
+        alpha (float): Smoothing factor, 2 / (span + 1)
+        
+    Returns:
+        numpy.ndarray: EMA values
+    """
+    beta = 1.0 - alpha
+    out = np.empty_like(x)
+    s = np.nan
+    decay = 1.0
+    for i in range(x.size):
+        s, decay = _ema_step(s, decay, x[i], alpha, beta)
+        out[i] = s
+    return out
+
+@njit(_MACD_SIGNATURES, cache=True, fastmath=_FASTMATH)
+def _macd_kernel(x, alpha_fast, alpha_slow, alpha_signal):
+    """
+    Fast/slow EMAs, MACD line, signal line and histogram in one fused pass
+    
+    Args:
+        x (numpy.ndarray): Price data
+        alpha_fast (float): Fast EMA smoothing factor
+        alpha_slow (float): Slow EMA smoothing factor
+        alpha_signal (float): Signal EMA smoothing factor
+        
+    Returns:
+        tuple: (Fast EMA, Slow EMA, MACD line, Signal line, MACD histogram)
+    """
+    beta_fast = 1.0 - alpha_fast
+    beta_slow = 1.0 - alpha_slow
+    beta_signal = 1.0 - alpha_signal
+    
+    ema_fast = np.empty_like(x)
+    ema_slow = np.empty_like(x)
+    macd_line = np.empty_like(x)
+    signal_line = np.empty_like(x)
+    histogram = np.empty_like(x)
+    
+    ef = es = esig = np.nan
+    decay_fast = decay_slow = decay_signal = 1.0
+    for i in range(x.size):
+        v = x[i]
+        ef, decay_fast = _ema_step(ef, decay_fast, v, alpha_fast, beta_fast)
+        es, decay_slow = _ema_step(es, decay_slow, v, alpha_slow, beta_slow)
+        m = ef - es
+        esig, decay_signal = _ema_step(esig, decay_signal, m, alpha_signal, beta_signal)
+        
+        ema_fast[i] = ef
+        ema_slow[i] = es
+        macd_line[i] = m
+        signal_line[i] = esig
+        histogram[i] = m - esig
+    
+    return ema_fast, ema_slow, macd_line, signal_line, histogram
+
+@njit(_RSI_SIGNATURES, cache=True, fastmath=_FASTMATH)
+def _rsi_kernel(x, window):
+    """
+    Relative Strength Index with Wilder's smoothing in one pass
+    
+    Args:
+        x (numpy.ndarray): Price data
+        window (int): Period for RSI calculation
+        
+    Returns:
+        numpy.ndarray: RSI values (NaN for the first `window` rows)
+    """
+    n = x.size
+    out = np.full_like(x, np.nan)
+    if n <= window:
+        return out
+    
+    # Seed with the simple average of the first `window` price changes
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, window + 1):
+        delta = x[i] - x[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        elif delta < 0:
+            avg_loss -= delta
+    avg_gain /= window
+    avg_loss /= window
+    
+    for i in range(window, n):
+        if i > window:
+            # NaN changes compare False on both sides and count as no change
+            delta = x[i] - x[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = (avg_gain * (window - 1) + gain) / window
+            avg_loss = (avg_loss * (window - 1) + loss) / window
+        
+        if avg_loss == 0.0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return out
+
+# High-low ranges at or below this count as a flat window
+_RANGE_EPS = 1e-12
+
+def _range_ratio(num, den):
+    """
+    Position of a price within its high-low range, branchless
+    
+    Flat windows (zero range) sit at the midpoint, 0.5, instead of producing
+    inf/NaN; warm-up rows with no range yet stay NaN.
+    
+    Args:
+        num (numpy.ndarray): Distance from one end of the range
+        den (numpy.ndarray): Width of the range
+        
+    Returns:
+        numpy.ndarray: num / den
+    """
+    out = np.full_like(num, 0.5)
+    out[np.isnan(den)] = np.nan
+    return np.divide(num, den, out=out, where=den > _RANGE_EPS)
+
+def _tr_max(h, l, pc):
+    """
+    True range as the elementwise max of the three candidate ranges, skipping NaNs
+    
+    Args:
+        h (numpy.ndarray): High prices
+        l (numpy.ndarray): Low prices
+        pc (numpy.ndarray): Previous close prices
+        
+    Returns:
+        numpy.ndarray: True range values
+    """
+    return np.fmax(np.fmax(h - l, np.abs(h - pc)), np.abs(l - pc))
 
 class TechnicalIndicators:
     """Class to calculate various technical indicators for cryptocurrency data"""
     
     def __init__(self):
-        pass
+        # Without bottleneck, use pandas' Numba rolling engine if it works here
+        self._rolling_kwargs = {}
+        if bn is None:
+            numba_kwargs = {'engine': 'numba', 'engine_kwargs': {'parallel': True, 'nopython': True}}
+            try:
+                pd.Series([1.0, 2.0, 3.0]).rolling(window=2).mean(**numba_kwargs)
+                self._rolling_kwargs = numba_kwargs
+            except Exception:
+                pass
+    
+    def _rolling(self, data, window, how, min_periods=None):
+        """
+        Rolling window aggregate, computed with bottleneck when it is installed
+        
+        Args:
+            data (pandas.Series): Input data
+            window (int): Window length
+            how (str): 'mean', 'std', 'min' or 'max'
+            min_periods (int): Minimum observations per window (defaults to window)
+            
+        Returns:
+            pandas.Series: Aggregated values
+        """
+        # bottleneck rejects windows longer than the data; pandas handles them
+        if bn is not None and len(data) >= window:
+            move = getattr(bn, f'move_{how}')
+            kwargs = {'ddof': 1} if how == 'std' else {}
+            values = data.to_numpy()
+            if how in ('mean', 'std'):
+                # Running sums cancel badly in float32, so accumulate in float64
+                # and only store the result back in float32
+                out = move(values.astype(np.float64, copy=False), window, min_count=min_periods, **kwargs)
+                if values.dtype == np.float32:
+                    out = out.astype(np.float32)
+            else:
+                out = move(values, window, min_count=min_periods, **kwargs)
+            return pd.Series(out, index=data.index, name=data.name)
+        
+        rolling = data.rolling(window=window, min_periods=min_periods)
+        return getattr(rolling, how)(**self._rolling_kwargs)
     
     def simple_moving_average(self, data, window):
         """
@@ -18,7 +260,7 @@ class TechnicalIndicators:
         Returns:
             pandas.Series: SMA values
         """
-        return data.rolling(window=window, min_periods=1).mean()
+        return self._rolling(data, window, 'mean', min_periods=1)
     
     def exponential_moving_average(self, data, window):
         """
@@ -31,11 +273,12 @@ class TechnicalIndicators:
         Returns:
             pandas.Series: EMA values
         """
-        return data.ewm(span=window, adjust=False).mean()
+        ema = _ema_kernel(data.to_numpy(dtype=np.float64), 2.0 / (window + 1))
+        return pd.Series(ema, index=data.index, name=data.name)
     
     def relative_strength_index(self, data, window=14):
         """
-        Calculate Relative Strength Index (RSI)
+        Calculate Relative Strength Index (RSI) using Wilder's smoothing
         
         Args:
             data (pandas.Series): Price data
@@ -44,14 +287,8 @@ class TechnicalIndicators:
         Returns:
             pandas.Series: RSI values
         """
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        rsi = _rsi_kernel(data.to_numpy(dtype=np.float64), window)
+        return pd.Series(rsi, index=data.index)
     
     def macd(self, data, fast=12, slow=26, signal=9):
         """
@@ -66,14 +303,18 @@ class TechnicalIndicators:
         Returns:
             tuple: (MACD line, Signal line, MACD histogram)
         """
-        ema_fast = self.exponential_moving_average(data, fast)
-        ema_slow = self.exponential_moving_average(data, slow)
+        _, _, macd_line, signal_line, histogram = _macd_kernel(
+            data.to_numpy(dtype=np.float64),
+            2.0 / (fast + 1),
+            2.0 / (slow + 1),
+            2.0 / (signal + 1)
+        )
         
-        macd_line = ema_fast - ema_slow
-        signal_line = self.exponential_moving_average(macd_line, signal)
-        histogram = macd_line - signal_line
-        
-        return macd_line, signal_line, histogram
+        return (
+            pd.Series(macd_line, index=data.index),
+            pd.Series(signal_line, index=data.index),
+            pd.Series(histogram, index=data.index)
+        )
     
     def bollinger_bands(self, data, window=20, num_std=2):
         """
@@ -88,7 +329,7 @@ class TechnicalIndicators:
             tuple: (Upper band, Middle band, Lower band)
         """
         sma = self.simple_moving_average(data, window)
-        std = data.rolling(window=window).std()
+        std = self._rolling(data, window, 'std')
         
         upper_band = sma + (std * num_std)
         lower_band = sma - (std * num_std)
@@ -109,11 +350,12 @@ class TechnicalIndicators:
         Returns:
             tuple: (%K, %D)
         """
-        lowest_low = low.rolling(window=k_period).min()
-        highest_high = high.rolling(window=k_period).max()
+        lowest_low = self._rolling(low, k_period, 'min')
+        highest_high = self._rolling(high, k_period, 'max')
         
-        k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-        d_percent = k_percent.rolling(window=d_period).mean()
+        ratio = _range_ratio((close - lowest_low).to_numpy(), (highest_high - lowest_low).to_numpy())
+        k_percent = pd.Series(100 * ratio, index=close.index)
+        d_percent = self._rolling(k_percent, d_period, 'mean')
         
         return k_percent, d_percent
     
@@ -130,10 +372,11 @@ class TechnicalIndicators:
         Returns:
             pandas.Series: Williams %R values
         """
-        highest_high = high.rolling(window=period).max()
-        lowest_low = low.rolling(window=period).min()
+        highest_high = self._rolling(high, period, 'max')
+        lowest_low = self._rolling(low, period, 'min')
         
-        williams_r = -100 * ((highest_high - close) / (highest_high - lowest_low))
+        ratio = _range_ratio((highest_high - close).to_numpy(), (highest_high - lowest_low).to_numpy())
+        williams_r = pd.Series(-100 * ratio, index=close.index)
         
         return williams_r
     
@@ -150,28 +393,39 @@ class TechnicalIndicators:
         Returns:
             pandas.Series: ATR values
         """
-        # True Range calculation
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
+        c = close.to_numpy()
+        
+        # Previous close, shifted once; the first row uses its own close
+        # (within the bar's range, so its true range is just high - low)
+        prev_close = np.concatenate((c[:1], c[:-1]))
         
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+        true_range = _tr_max(high.to_numpy(), low.to_numpy(), prev_close)
+        atr = self._rolling(pd.Series(true_range, index=close.index), period, 'mean')
         
         return atr
     
-    def calculate_all_indicators(self, df, selected_indicators):
+    def calculate_all_indicators(self, df, selected_indicators, streaming=False, precision='float64',
+                                 copy=True):
         """
         Calculate selected technical indicators for the given DataFrame
         
         Args:
             df (pandas.DataFrame): OHLCV data
             selected_indicators (list): List of indicators to calculate
+            streaming (bool): Replay the rows through StreamingIndicators instead
+            precision (str): 'float64' (OHLC columns are left as they are), or 'float32'
+                to halve the memory traffic of the OHLC columns
+            copy (bool): Work on a copy of df. With False, missing OHLC columns and the
+                float32 cast are applied to df itself; a complete OHLC frame needing no
+                cast is left untouched
             
         Returns:
             pandas.DataFrame: DataFrame with added technical indicators
         """
-        result_df = df.copy()
+        if precision not in ('float64', 'float32'):
+            raise ValueError(f"precision must be 'float64' or 'float32', got {precision!r}")
+        
+        result_df = df.copy() if copy else df
         
         # Ensure we have the required columns
         if 'close' not in result_df.columns:
@@ -188,44 +442,187 @@ class TechnicalIndicators:
         if 'low' not in result_df.columns:
             result_df['low'] = result_df['close']
         
-        # Calculate selected indicators
+        # Prices carry far fewer than float32's ~7 significant digits of signal, so
+        # float32 is enough for storage and output when requested; rolling means and standard
+        # deviations still accumulate in float64 (see _rolling)
+        dtype = np.dtype(precision)
+        if precision == 'float32':
+            for col in ('open', 'high', 'low', 'close'):
+                if result_df[col].dtype != dtype:
+                    result_df[col] = result_df[col].astype(dtype)
+        
+        if streaming:
+            # Each row is touched once, in order, as it would be on a live feed
+            stream = StreamingIndicators(selected_indicators)
+            rows = [stream.push(row) for row in result_df[['high', 'low', 'close']].to_dict('records')]
+            columns = {name: np.array([row[name] for row in rows], dtype=dtype)
+                       for name in stream.columns}
+        elif pl is not None and len(result_df) >= POLARS_ROW_THRESHOLD:
+            ohlc = pl.from_pandas(result_df[['open', 'high', 'low', 'close']])
+            indicators = self.calculate_all_indicators_polars(ohlc, selected_indicators)
+            columns = {name: indicators[name].to_numpy()
+                       for name in indicators.columns if name not in ohlc.columns}
+        else:
+            close = result_df['close']
+            # The kernels take float arrays; a float64 close column is not copied
+            x = close.to_numpy(dtype=dtype)
+            selected = set(selected_indicators)
+            
+            # Compute each shared sub-result once: MACD's fast/slow EMAs are EMA_12/EMA_26,
+            # Bollinger's middle band is SMA_20, Stochastic and Williams %R share the 14-period range
+            cache = {}
+            if 'MACD' in selected:
+                (cache['ema_12'], cache['ema_26'], cache['macd'],
+                 cache['macd_signal'], cache['macd_hist']) = _macd_kernel(x, 2.0 / 13, 2.0 / 27, 2.0 / 10)
+            else:
+                if 'EMA_12' in selected:
+                    cache['ema_12'] = _ema_kernel(x, 2.0 / 13)
+                if 'EMA_26' in selected:
+                    cache['ema_26'] = _ema_kernel(x, 2.0 / 27)
+            if selected & {'SMA_20', 'Bollinger_Bands'}:
+                cache['sma_20'] = self.simple_moving_average(close, 20).to_numpy()
+            if selected & {'Stochastic', 'Williams_R'}:
+                cache['high_14'] = self._rolling(result_df['high'], 14, 'max').to_numpy()
+                cache['low_14'] = self._rolling(result_df['low'], 14, 'min').to_numpy()
+                cache['range_14'] = cache['high_14'] - cache['low_14']
+            
+            # Assemble the requested columns from the shared arrays
+            columns = {}
+            for indicator in selected_indicators:
+                if indicator == "SMA_20":
+                    columns['SMA_20'] = cache['sma_20']
+                elif indicator == "SMA_50":
+                    columns['SMA_50'] = self.simple_moving_average(close, 50).to_numpy()
+                elif indicator == "EMA_12":
+                    columns['EMA_12'] = cache['ema_12']
+                elif indicator == "EMA_26":
+                    columns['EMA_26'] = cache['ema_26']
+                elif indicator == "RSI":
+                    columns['RSI'] = _rsi_kernel(x, 14)
+                elif indicator == "MACD":
+                    columns['MACD'] = cache['macd']
+                    columns['MACD_Signal'] = cache['macd_signal']
+                    columns['MACD_Histogram'] = cache['macd_hist']
+                elif indicator == "Bollinger_Bands":
+                    band = self._rolling(close, 20, 'std').to_numpy() * 2
+                    columns['BB_Upper'] = cache['sma_20'] + band
+                    columns['BB_Middle'] = cache['sma_20']
+                    columns['BB_Lower'] = cache['sma_20'] - band
+                elif indicator == "Stochastic":
+                    k_percent = 100 * _range_ratio(x - cache['low_14'], cache['range_14'])
+                    columns['Stoch_K'] = k_percent
+                    columns['Stoch_D'] = self._rolling(pd.Series(k_percent), 3, 'mean').to_numpy()
+                elif indicator == "Williams_R":
+                    columns['Williams_R'] = -100 * _range_ratio(cache['high_14'] - x, cache['range_14'])
+                elif indicator == "ATR":
+                    true_range = _tr_max(
+                        result_df['high'].to_numpy(), result_df['low'].to_numpy(),
+                        np.concatenate((x[:1], x[:-1]))
+                    )
+                    columns['ATR'] = self._rolling(pd.Series(true_range), 14, 'mean').to_numpy()
+        
+        # One block concat instead of a BlockManager insert per column
+        if columns:
+            result_df = pd.concat(
+                [result_df, pd.DataFrame(columns, index=result_df.index)], axis=1, copy=False
+            )
+        
+        return result_df
+    
+    def calculate_all_indicators_polars(self, df, selected_indicators):
+        """
+        Calculate selected technical indicators with Polars in one lazy query
+        
+        Args:
+            df (polars.DataFrame): OHLC data with 'open', 'high', 'low' and 'close' columns
+            selected_indicators (list): List of indicators to calculate
+            
+        Returns:
+            polars.DataFrame: DataFrame with added technical indicators
+        """
+        if pl is None:
+            raise ImportError("polars is required for calculate_all_indicators_polars")
+        
+        close = pl.col('close')
+        high = pl.col('high')
+        low = pl.col('low')
+        
+        # Shared sub-results are materialized as temporary columns first, so
+        # every indicator reading them shares one evaluation
+        shared = {
+            '_ema_12': close.ewm_mean(span=12, adjust=False),
+            '_ema_26': close.ewm_mean(span=26, adjust=False),
+            '_sma_20': close.rolling_mean(20, min_samples=1),
+            '_high_14': high.rolling_max(14),
+            '_low_14': low.rolling_min(14)
+        }
+        derived = {
+            '_macd': pl.col('_ema_12') - pl.col('_ema_26'),
+            '_range_14': pl.col('_high_14') - pl.col('_low_14')
+        }
+        ema_12, ema_26, sma_20 = pl.col('_ema_12'), pl.col('_ema_26'), pl.col('_sma_20')
+        highest_high, lowest_low = pl.col('_high_14'), pl.col('_low_14')
+        macd_line, price_range = pl.col('_macd'), pl.col('_range_14')
+        
+        def range_ratio(num):
+            # Same convention as _range_ratio: NaN while warming up, 0.5 for a flat window
+            return (pl.when(price_range.is_null()).then(None)
+                    .when(price_range > _RANGE_EPS).then(num / price_range)
+                    .otherwise(0.5))
+        
+        exprs = []
         for indicator in selected_indicators:
             if indicator == "SMA_20":
-                result_df['SMA_20'] = self.simple_moving_average(result_df['close'], 20)
+                exprs.append(sma_20.alias('SMA_20'))
             elif indicator == "SMA_50":
-                result_df['SMA_50'] = self.simple_moving_average(result_df['close'], 50)
+                exprs.append(close.rolling_mean(50, min_samples=1).alias('SMA_50'))
             elif indicator == "EMA_12":
-                result_df['EMA_12'] = self.exponential_moving_average(result_df['close'], 12)
+                exprs.append(ema_12.alias('EMA_12'))
             elif indicator == "EMA_26":
-                result_df['EMA_26'] = self.exponential_moving_average(result_df['close'], 26)
+                exprs.append(ema_26.alias('EMA_26'))
             elif indicator == "RSI":
-                result_df['RSI'] = self.relative_strength_index(result_df['close'])
+                # Wilder's seeding has no native expression, so reuse the Numba kernel;
+                # a Float32 close stays Float32, anything else is computed as Float64
+                rsi_dtype = pl.Float32 if df.collect_schema()['close'] == pl.Float32 else pl.Float64
+                exprs.append(close.map_batches(
+                    lambda s: pl.Series(_rsi_kernel(s.cast(rsi_dtype).to_numpy(), 14)),
+                    return_dtype=rsi_dtype
+                ).alias('RSI'))
             elif indicator == "MACD":
-                macd_line, signal_line, histogram = self.macd(result_df['close'])
-                result_df['MACD'] = macd_line
-                result_df['MACD_Signal'] = signal_line
-                result_df['MACD_Histogram'] = histogram
+                signal_line = macd_line.ewm_mean(span=9, adjust=False)
+                exprs += [
+                    macd_line.alias('MACD'),
+                    signal_line.alias('MACD_Signal'),
+                    (macd_line - signal_line).alias('MACD_Histogram')
+                ]
             elif indicator == "Bollinger_Bands":
-                upper, middle, lower = self.bollinger_bands(result_df['close'])
-                result_df['BB_Upper'] = upper
-                result_df['BB_Middle'] = middle
-                result_df['BB_Lower'] = lower
+                band = close.rolling_std(20, ddof=1) * 2
+                exprs += [
+                    (sma_20 + band).alias('BB_Upper'),
+                    sma_20.alias('BB_Middle'),
+                    (sma_20 - band).alias('BB_Lower')
+                ]
             elif indicator == "Stochastic":
-                k_percent, d_percent = self.stochastic_oscillator(
-                    result_df['high'], result_df['low'], result_df['close']
-                )
-                result_df['Stoch_K'] = k_percent
-                result_df['Stoch_D'] = d_percent
+                k_percent = pl.col('_stoch_k')
+                exprs += [k_percent.alias('Stoch_K'), k_percent.rolling_mean(3).alias('Stoch_D')]
             elif indicator == "Williams_R":
-                result_df['Williams_R'] = self.williams_r(
-                    result_df['high'], result_df['low'], result_df['close']
-                )
+                exprs.append((range_ratio(highest_high - close) * -100).alias('Williams_R'))
             elif indicator == "ATR":
-                result_df['ATR'] = self.average_true_range(
-                    result_df['high'], result_df['low'], result_df['close']
+                prev_close = close.shift(1).fill_null(close)
+                true_range = pl.max_horizontal(
+                    high - low, (high - prev_close).abs(), (low - prev_close).abs()
                 )
+                exprs.append(true_range.rolling_mean(14).alias('ATR'))
         
-        return result_df
+        return (
+            df.lazy()
+            .with_columns(**shared)
+            .with_columns(**derived)
+            .with_columns(_stoch_k=range_ratio(close - lowest_low) * 100)
+            .with_columns(exprs)
+            .drop([*shared, *derived, '_stoch_k'])
+            .collect()
+        )
     
     def get_trend_analysis(self, df):
         """
@@ -238,18 +635,21 @@ class TechnicalIndicators:
             dict: Trend analysis summary
         """
         analysis = {}
-        latest = df.iloc[-1]
+        
+        def last(col):
+            # Scalar read of one column's last value, without boxing the whole row
+            return df[col].iat[-1]
         
         # Moving average trend
         if 'SMA_20' in df.columns and 'SMA_50' in df.columns:
-            if latest['SMA_20'] > latest['SMA_50']:
+            if last('SMA_20') > last('SMA_50'):
                 analysis['ma_trend'] = 'Bullish'
             else:
                 analysis['ma_trend'] = 'Bearish'
         
         # RSI analysis
         if 'RSI' in df.columns:
-            rsi = latest['RSI']
+            rsi = last('RSI')
             if rsi > 70:
                 analysis['rsi_signal'] = 'Overbought'
             elif rsi < 30:
@@ -259,9 +659,225 @@ class TechnicalIndicators:
         
         # MACD analysis
         if 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-            if latest['MACD'] > latest['MACD_Signal']:
+            if last('MACD') > last('MACD_Signal'):
                 analysis['macd_signal'] = 'Bullish'
             else:
                 analysis['macd_signal'] = 'Bearish'
         
         return analysis
+
+class _RollingWindow:
+    """Fixed-length window with O(1) mean/variance updates and amortized O(1) min/max"""
+    
+    def __init__(self, window, track_extremes=False):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.track_extremes = track_extremes
+        self._seen = 0
+        self._max = deque()  # (position, value), values decreasing
+        self._min = deque()  # (position, value), values increasing
+    
+    def push(self, x):
+        """
+        Add an observation, dropping the oldest one once the window is full
+        
+        Args:
+            x (float): New observation
+        """
+        # Welford add
+        self.values.append(x)
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+        
+        # Welford remove
+        if n > self.window:
+            old = self.values.popleft()
+            n -= 1
+            delta = old - self.mean
+            self.mean -= delta / n
+            self.m2 -= delta * (old - self.mean)
+        
+        # Monotonic deques: the front is always the current extreme
+        if self.track_extremes:
+            position = self._seen
+            while self._max and self._max[-1][1] <= x:
+                self._max.pop()
+            self._max.append((position, x))
+            while self._min and self._min[-1][1] >= x:
+                self._min.pop()
+            self._min.append((position, x))
+            
+            expired = position - self.window
+            if self._max[0][0] <= expired:
+                self._max.popleft()
+            if self._min[0][0] <= expired:
+                self._min.popleft()
+        
+        self._seen += 1
+    
+    @property
+    def full(self):
+        return len(self.values) == self.window
+    
+    def std(self):
+        """Sample standard deviation (ddof=1) of a full window, NaN otherwise"""
+        if not self.full or self.window < 2:
+            return np.nan
+        return np.sqrt(max(self.m2, 0.0) / (self.window - 1))
+    
+    def max(self):
+        return self._max[0][1] if self.full else np.nan
+    
+    def min(self):
+        return self._min[0][1] if self.full else np.nan
+
+class StreamingIndicators:
+    """Incrementally updated technical indicators, one OHLC row at a time
+    
+    Each push() costs O(1) regardless of history length, so a live feed can
+    append a tick without recomputing every indicator from scratch. Rows are
+    expected to be gap-free (DataFetcher forward-fills its OHLC data).
+    """
+    
+    OUTPUTS = {
+        "SMA_20": ['SMA_20'],
+        "SMA_50": ['SMA_50'],
+        "EMA_12": ['EMA_12'],
+        "EMA_26": ['EMA_26'],
+        "RSI": ['RSI'],
+        "MACD": ['MACD', 'MACD_Signal', 'MACD_Histogram'],
+        "Bollinger_Bands": ['BB_Upper', 'BB_Middle', 'BB_Lower'],
+        "Stochastic": ['Stoch_K', 'Stoch_D'],
+        "Williams_R": ['Williams_R'],
+        "ATR": ['ATR']
+    }
+    
+    def __init__(self, selected_indicators):
+        """
+        Args:
+            selected_indicators (list): Indicators to maintain (same names as calculate_all_indicators)
+        """
+        self.selected = [indicator for indicator in selected_indicators if indicator in self.OUTPUTS]
+        self.columns = [name for indicator in self.selected for name in self.OUTPUTS[indicator]]
+        
+        # EMAs: s += alpha * (x - s)
+        self.alpha_12 = 2.0 / 13
+        self.alpha_26 = 2.0 / 27
+        self.alpha_9 = 2.0 / 10
+        self.ema_12 = self.ema_26 = self.signal = np.nan
+        
+        # RSI (Wilder's smoothing over 14 changes)
+        self.rsi_window = 14
+        self.changes = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        
+        self.prev_close = None
+        self.close_20 = _RollingWindow(20)
+        self.close_50 = _RollingWindow(50)
+        self.high_14 = _RollingWindow(14, track_extremes=True)
+        self.low_14 = _RollingWindow(14, track_extremes=True)
+        self.true_range_14 = _RollingWindow(14)
+        self.stoch_k = deque(maxlen=3)
+    
+    def push(self, row):
+        """
+        Update every selected indicator with a new row
+        
+        Args:
+            row (dict): Row with a 'close' value and optional 'high'/'low'
+            
+        Returns:
+            dict: Current value of each output column
+        """
+        close = float(row['close'])
+        high = float(row.get('high', close))
+        low = float(row.get('low', close))
+        selected = self.selected
+        values = {}
+        
+        if 'EMA_12' in selected or 'EMA_26' in selected or 'MACD' in selected:
+            if np.isnan(self.ema_12):
+                self.ema_12 = self.ema_26 = close
+            else:
+                self.ema_12 += self.alpha_12 * (close - self.ema_12)
+                self.ema_26 += self.alpha_26 * (close - self.ema_26)
+            values['EMA_12'] = self.ema_12
+            values['EMA_26'] = self.ema_26
+            
+            macd_line = self.ema_12 - self.ema_26
+            if np.isnan(self.signal):
+                self.signal = macd_line
+            else:
+                self.signal += self.alpha_9 * (macd_line - self.signal)
+            values['MACD'] = macd_line
+            values['MACD_Signal'] = self.signal
+            values['MACD_Histogram'] = macd_line - self.signal
+        
+        if 'SMA_20' in selected or 'Bollinger_Bands' in selected:
+            self.close_20.push(close)
+            band = 2 * self.close_20.std()
+            values['SMA_20'] = values['BB_Middle'] = self.close_20.mean
+            values['BB_Upper'] = self.close_20.mean + band
+            values['BB_Lower'] = self.close_20.mean - band
+        
+        if 'SMA_50' in selected:
+            self.close_50.push(close)
+            values['SMA_50'] = self.close_50.mean
+        
+        if 'RSI' in selected:
+            values['RSI'] = np.nan
+            if self.prev_close is not None:
+                delta = close - self.prev_close
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+                window = self.rsi_window
+                self.changes += 1
+                if self.changes <= window:
+                    # Seed with the simple average of the first `window` changes
+                    self.avg_gain += gain / window
+                    self.avg_loss += loss / window
+                else:
+                    self.avg_gain = (self.avg_gain * (window - 1) + gain) / window
+                    self.avg_loss = (self.avg_loss * (window - 1) + loss) / window
+                
+                if self.changes >= window:
+                    if self.avg_loss == 0.0:
+                        values['RSI'] = 100.0
+                    else:
+                        values['RSI'] = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        
+        if 'Stochastic' in selected or 'Williams_R' in selected:
+            self.high_14.push(high)
+            self.low_14.push(low)
+            highest_high = self.high_14.max()
+            lowest_low = self.low_14.min()
+            price_range = highest_high - lowest_low
+            
+            if price_range > _RANGE_EPS:
+                k_percent = 100 * (close - lowest_low) / price_range
+                williams_r = -100 * (highest_high - close) / price_range
+            elif np.isnan(price_range):
+                k_percent = williams_r = np.nan
+            else:
+                # Flat window: midpoint of the range, as in _range_ratio
+                k_percent, williams_r = 50.0, -50.0
+            self.stoch_k.append(k_percent)
+            values['Stoch_K'] = k_percent
+            values['Stoch_D'] = sum(self.stoch_k) / 3 if len(self.stoch_k) == 3 else np.nan
+            values['Williams_R'] = williams_r
+        
+        if 'ATR' in selected:
+            true_range = high - low
+            if self.prev_close is not None:
+                true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+            self.true_range_14.push(true_range)
+            values['ATR'] = self.true_range_14.mean if self.true_range_14.full else np.nan
+        
+        self.prev_close = close
+        
+        return {name: values[name] for name in self.columns}
@@ -1,7 +1,22 @@
 import pandas as pd
 import numpy as np
+import math
+from numba import njit, prange
 from datetime import datetime, timedelta
 
+try:
+    import bottleneck as bn
+except ImportError:  # NumPy/pandas fallbacks below
+    bn = None
+
+# Above this many cells (observations x assets) the fused Numba kernel
+# beats the separate NumPy passes in calculate_correlation_matrix
+PEARSON_JIT_THRESHOLD = 100_000
+
+# Default support/resistance targets: 5%, 10% and 15% below/above the price
+_SUPPORTS = np.array([0.95, 0.90, 0.85])
+_RESISTANCES = np.array([1.05, 1.10, 1.15])
+
 def format_currency(value, currency_symbol="$"):
     """
     Format currency values with appropriate suffix (K, M, B)
@@ -29,6 +44,30 @@ def format_currency(value, currency_symbol="$"):
     else:
         return f"{currency_symbol}{value:.2f}"
 
+def format_currency_series(values, currency_symbol="$"):
+    """
+    Format a whole Series of currency values like format_currency, without a per-row call
+    
+    Args:
+        values (pandas.Series): Currency values
+        currency_symbol (str): Currency symbol
+        
+    Returns:
+        pandas.Series: Formatted currency strings
+    """
+    v = values.to_numpy(dtype=np.float64)
+    
+    # Suffix bucket: 0 = none, 1 = K, 2 = M, 3 = B, 4 = T (same thresholds as format_currency)
+    idx = np.digitize(np.abs(v), [1e3, 1e6, 1e9, 1e12])
+    idx[np.isnan(v)] = 0
+    scaled = v / np.array([1.0, 1e3, 1e6, 1e9, 1e12])[idx]
+    suffix = np.array(['', 'K', 'M', 'B', 'T'])[idx]
+    
+    formatted = np.char.add(np.char.add(currency_symbol, np.char.mod('%.2f', scaled)), suffix)
+    formatted = np.where(np.isnan(v), "N/A", formatted)
+    
+    return pd.Series(formatted, index=values.index, dtype=object)
+
 def format_percentage(value, decimal_places=2):
     """
     Format percentage values
@@ -61,9 +100,25 @@ def calculate_percentage_change(old_value, new_value):
     
     return ((new_value - old_value) / old_value) * 100
 
+def _log_returns(price_data):
+    """
+    Log returns of a price series, aligned to it (NaN on the first row)
+    
+    Args:
+        price_data (pandas.Series): Price data
+        
+    Returns:
+        numpy.ndarray: Log returns
+    """
+    prices = np.ascontiguousarray(price_data.to_numpy(), dtype=np.float64)
+    returns = np.empty_like(prices)
+    returns[:1] = np.nan
+    returns[1:] = np.diff(np.log(prices))
+    return returns
+
 def calculate_volatility(price_data, window=30):
     """
-    Calculate price volatility (standard deviation of returns)
+    Calculate price volatility (standard deviation of log returns)
     
     Args:
         price_data (pandas.Series): Price data
@@ -72,9 +127,14 @@ def calculate_volatility(price_data, window=30):
     Returns:
         pandas.Series: Volatility values
     """
-    returns = price_data.pct_change()
-    volatility = returns.rolling(window=window).std() * np.sqrt(365)  # Annualized
-    return volatility
+    returns = _log_returns(price_data)
+    if bn is not None and returns.size >= window:
+        rolling_std = bn.move_std(returns, window, ddof=1)
+    else:
+        rolling_std = pd.Series(returns).rolling(window=window).std().to_numpy()
+    
+    volatility = rolling_std * math.sqrt(365)  # Annualized
+    return pd.Series(volatility, index=price_data.index)
 
 def calculate_sharpe_ratio(price_data, risk_free_rate=0.02):
     """
@@ -87,14 +147,15 @@ def calculate_sharpe_ratio(price_data, risk_free_rate=0.02):
     Returns:
         float: Sharpe ratio
     """
-    returns = price_data.pct_change().dropna()
+    returns = _log_returns(price_data)
+    returns = returns[~np.isnan(returns)]
     
     if len(returns) == 0:
         return 0
     
-    # Annualized return and volatility
-    annual_return = (1 + returns.mean()) ** 365 - 1
-    annual_volatility = returns.std() * np.sqrt(365)
+    # Annualized return and volatility; log returns compound by addition
+    annual_return = math.expm1(returns.mean() * 365)
+    annual_volatility = returns.std(ddof=1) * math.sqrt(365) if len(returns) > 1 else np.nan
     
     if annual_volatility == 0:
         return 0
@@ -112,16 +173,97 @@ def calculate_max_drawdown(price_data):
     Returns:
         float: Maximum drawdown percentage
     """
-    # Calculate running maximum
-    running_max = price_data.expanding().max()
+    prices = np.asarray(price_data, dtype=np.float64)
+    if prices.size == 0:
+        return np.nan
     
-    # Calculate drawdown
-    drawdown = (price_data - running_max) / running_max
+    # Running maximum in one ufunc pass (fmax skips NaN gaps like expanding().max())
+    running_max = np.fmax.accumulate(prices)
+    
+    # Drawdown relative to the running maximum; a non-positive peak has no drawdown
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(running_max > 0, prices / running_max - 1.0, 0.0)
     
     # Return maximum drawdown (most negative value)
-    max_drawdown = drawdown.min()
+    max_drawdown = np.nanmin(np.where(np.isnan(prices), np.nan, drawdown))
     
-    return max_drawdown * 100  # Convert to percentage
+    return float(max_drawdown * 100)  # Convert to percentage
+
+@njit(parallel=True, fastmath=True, cache=True, error_model='numpy')
+def _pearson(X):
+    """
+    Pearson correlation matrix of the columns of X in fused passes
+    
+    Args:
+        X (numpy.ndarray): Column-major (Fortran-ordered) observations x assets
+        
+    Returns:
+        numpy.ndarray: Correlation matrix
+    """
+    n_obs, n_assets = X.shape
+    Xc = np.empty_like(X)
+    norm = np.empty(n_assets)
+    
+    # Mean, centering and norm per column, one column per thread
+    for k in prange(n_assets):
+        total = 0.0
+        for t in range(n_obs):
+            total += X[t, k]
+        mean = total / n_obs
+        
+        sq = 0.0
+        for t in range(n_obs):
+            d = X[t, k] - mean
+            Xc[t, k] = d
+            sq += d * d
+        norm[k] = np.sqrt(sq)
+    
+    # Strict upper triangle only, mirrored onto a unit diagonal
+    corr = np.eye(n_assets, dtype=X.dtype)
+    for i in prange(n_assets):
+        for j in range(i + 1, n_assets):
+            dot = 0.0
+            for t in range(n_obs):
+                dot += Xc[t, i] * Xc[t, j]
+            corr[i, j] = dot / (norm[i] * norm[j])
+            corr[j, i] = corr[i, j]
+    
+    return corr
+
+def calculate_correlation_matrix(price_data, dtype=np.float64):
+    """
+    Calculate the Pearson correlation matrix between price columns
+    
+    Args:
+        price_data (pandas.DataFrame): Price data, one column per asset
+        dtype (numpy.dtype): Working precision (float32 halves memory traffic)
+        
+    Returns:
+        pandas.DataFrame: Correlation matrix
+    """
+    X = price_data.dropna().to_numpy(dtype=dtype)
+    n_assets = X.shape[1]
+    
+    if X.size > PEARSON_JIT_THRESHOLD:
+        corr = _pearson(np.asfortranarray(X))
+        return pd.DataFrame(corr, index=price_data.columns, columns=price_data.columns)
+    
+    X = np.ascontiguousarray(X)
+    
+    # Center once; Xc.T @ Xc is a single GEMM (NumPy hands A.T @ A to BLAS syrk)
+    Xc = X - X.mean(axis=0)
+    norm = np.sqrt((Xc * Xc).sum(axis=0))
+    gram = Xc.T @ Xc
+    
+    # The matrix is symmetric with a unit diagonal, so only normalize the
+    # strict upper triangle and mirror it
+    rows, cols = np.triu_indices(n_assets, 1)
+    corr = np.eye(n_assets, dtype=X.dtype)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr[rows, cols] = gram[rows, cols] / (norm[rows] * norm[cols])
+    corr[cols, rows] = corr[rows, cols]
+    
+    return pd.DataFrame(corr, index=price_data.columns, columns=price_data.columns)
 
 def get_price_targets(current_price, support_resistance_levels=None):
     """
@@ -141,23 +283,14 @@ def get_price_targets(current_price, support_resistance_levels=None):
     }
     
     if support_resistance_levels:
-        for level in support_resistance_levels:
-            if level < current_price:
-                targets['support_levels'].append(level)
-            else:
-                targets['resistance_levels'].append(level)
+        levels = np.asarray(support_resistance_levels)
+        below = levels < current_price
+        targets['support_levels'] = levels[below].tolist()
+        targets['resistance_levels'] = levels[~below].tolist()
     else:
         # Simple percentage-based targets
-        targets['support_levels'] = [
-            current_price * 0.95,  # 5% below
-            current_price * 0.90,  # 10% below
-            current_price * 0.85   # 15% below
-        ]
-        targets['resistance_levels'] = [
-            current_price * 1.05,  # 5% above
-            current_price * 1.10,  # 10% above
-            current_price * 1.15   # 15% above
-        ]
+        targets['support_levels'] = (current_price * _SUPPORTS).tolist()
+        targets['resistance_levels'] = (current_price * _RESISTANCES).tolist()
     
     return targets
 
@@ -180,9 +313,19 @@ def validate_dataframe(df, required_columns=None):
         if missing_columns:
             return False, f"Missing required columns: {missing_columns}"
     
-    # Check for excessive NaN values
-    nan_percentage = (df.isnull().sum() / len(df)) * 100
-    high_nan_columns = nan_percentage[nan_percentage > 50].index.tolist()
+    # Check for excessive NaN values; clean float columns exit after a single
+    # anynan scan, and NaNs are only counted in columns that have any
+    high_nan_columns = []
+    for col, series in df.items():
+        values = series.to_numpy()
+        if values.dtype.kind == 'f':
+            has_nan = bn.anynan(values) if bn is not None else np.isnan(values).any()
+            nan_fraction = np.isnan(values).mean() if has_nan else 0.0
+        else:
+            nan_fraction = series.isna().mean()
+        
+        if nan_fraction > 0.5:
+            high_nan_columns.append(col)
     
     if high_nan_columns:
         return False, f"Columns with >50% NaN values: {high_nan_columns}"
@@ -210,20 +353,21 @@ def clean_data(df, fill_method='forward'):
     
     # Handle NaN values
     if fill_method == 'forward':
-        df_clean = df_clean.fillna(method='ffill')
+        df_clean = df_clean.ffill()
     elif fill_method == 'backward':
-        df_clean = df_clean.fillna(method='bfill')
+        df_clean = df_clean.bfill()
     elif fill_method == 'interpolate':
         df_clean = df_clean.interpolate()
     
     # Remove any remaining NaN values
     df_clean = df_clean.dropna()
     
-    # Ensure positive values for price columns
+    # Ensure positive values for price columns (one combined mask, one reindex)
     price_columns = ['open', 'high', 'low', 'close', 'price']
-    for col in price_columns:
-        if col in df_clean.columns:
-            df_clean = df_clean[df_clean[col] > 0]
+    present = [col for col in price_columns if col in df_clean.columns]
+    if present:
+        mask = np.logical_and.reduce([df_clean[col].to_numpy() > 0 for col in present])
+        df_clean = df_clean.loc[mask]
     
     return df_clean
 
@@ -288,6 +432,35 @@ def calculate_fear_greed_index(rsi, volatility, volume_change, price_change):
     
     return round(fear_greed_index, 1), sentiment
 
+def calculate_fear_greed_series(rsi, volatility, volume_change, price_change):
+    """
+    Vectorized calculate_fear_greed_index over whole arrays
+    
+    Args:
+        rsi (numpy.ndarray): RSI values
+        volatility (numpy.ndarray): Volatility percentages
+        volume_change (numpy.ndarray): Volume change percentages
+        price_change (numpy.ndarray): Price change percentages
+        
+    Returns:
+        tuple: (index_values, sentiments) as numpy arrays
+    """
+    rsi = np.asarray(rsi, dtype=np.float64)
+    
+    # Same component scores as calculate_fear_greed_index, as ufunc passes
+    rsi_score = np.where((rsi >= 0) & (rsi <= 100), rsi, 50)
+    vol_score = np.clip(100 - np.asarray(volatility, dtype=np.float64) * 2, 0, 100)
+    volume_score = np.clip(50 + np.asarray(volume_change, dtype=np.float64), 0, 100)
+    price_score = np.clip(50 + np.asarray(price_change, dtype=np.float64), 0, 100)
+    
+    fear_greed_index = (rsi_score * 0.3 + vol_score * 0.25 +
+                        volume_score * 0.25 + price_score * 0.2)
+    
+    labels = np.array(["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
+    sentiment = labels[np.digitize(fear_greed_index, [25, 45, 55, 75])]
+    
+    return np.round(fear_greed_index, 1), sentiment
+
 def format_timestamp(timestamp, format_str="%Y-%m-%d %H:%M:%S"):
     """
     Format timestamp for display
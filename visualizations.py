@@ -1,8 +1,85 @@
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from plotly.colors import get_colorscale
 import pandas as pd
 import numpy as np
+import orjson
+from numba import njit
+
+try:
+    from plotly_resampler import FigureResampler, MinMaxLTTB
+except ImportError:  # optional; charts are sent at full resolution without it
+    FigureResampler = None
+
+# Roughly one point per horizontal pixel of a wide chart
+MAX_POINTS = 2000
+
+# plotly.subplots is only needed by the multi-panel charts; imported on first use
+_make_subplots = None
+
+def _subplots(**kwargs):
+    """
+    Call plotly.subplots.make_subplots, importing it on first use
+    
+    Args:
+        **kwargs: Arguments for make_subplots
+        
+    Returns:
+        plotly.graph_objects.Figure: Figure with the subplot grid
+    """
+    global _make_subplots
+    if _make_subplots is None:
+        from plotly.subplots import make_subplots as _make_subplots
+    return _make_subplots(**kwargs)
+
+def _json_default(obj):
+    """
+    Fallback for values orjson cannot serialize natively
+    
+    Args:
+        obj: Value to convert (non-contiguous arrays, timestamps)
+        
+    Returns:
+        JSON-serializable equivalent of obj
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to JSON")
+
+@njit(cache=True)
+def _zone_runs(values, low, high):
+    """
+    Find contiguous runs of values above high (overbought) or below low (oversold)
+    
+    Args:
+        values (numpy.ndarray): Indicator values; NaN counts as outside both zones
+        low (float): Oversold threshold
+        high (float): Overbought threshold
+        
+    Returns:
+        tuple: (starts, ends, zones) inclusive run bounds and +1/-1 for overbought/oversold
+    """
+    n = values.shape[0]
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    zones = np.empty(n, dtype=np.int8)
+    count = 0
+    current = 0
+    for i in range(n):
+        v = values[i]
+        zone = 1 if v > high else (-1 if v < low else 0)
+        if zone != current:
+            if current != 0:
+                ends[count - 1] = i - 1
+            if zone != 0:
+                starts[count] = i
+                zones[count] = zone
+                count += 1
+            current = zone
+    if current != 0:
+        ends[count - 1] = n - 1
+    return starts[:count], ends[:count], zones[:count]
 
 class ChartVisualizer:
     """Class to create interactive charts for cryptocurrency data analysis"""
@@ -17,6 +94,250 @@ class ChartVisualizer:
             'info': '#17a2b8',
             'background': '#f8f9fa'
         }
+        self._resample = FigureResampler is not None
+        # Compile (or load from cache) now rather than on the first RSI chart
+        _zone_runs(np.zeros(4, dtype=np.float32), 30.0, 70.0)
+    
+    def _resampled(self, fig):
+        """
+        Wrap a figure so long traces are downsampled (MinMaxLTTB) before they are sent
+        
+        Args:
+            fig (plotly.graph_objects.Figure): Figure to wrap
+            
+        Returns:
+            plotly.graph_objects.Figure: FigureResampler, or fig when plotly-resampler is not installed
+        """
+        if not self._resample:
+            return fig
+        return FigureResampler(fig, default_downsampler=MinMaxLTTB(), default_n_shown_samples=MAX_POINTS)
+    
+    def _mk(self, trace_type, **kwargs):
+        """
+        Plain trace dict, which skips the per-attribute validation of go trace classes
+        
+        Args:
+            trace_type (str): Plotly trace type ('scattergl', 'bar', ...)
+            **kwargs: Trace attributes, nested as dicts
+            
+        Returns:
+            dict: Trace spec
+        """
+        return dict(type=trace_type, **kwargs)
+    
+    def _figure(self, data, layout):
+        """
+        Build a figure from trace and layout dicts without Plotly's input validation
+        
+        Inputs here come from our own DataFrames, so validation only costs time.
+        Layout keys must be given nested (title=dict(text=...)), not as magic
+        underscores, since nothing normalizes them.
+        
+        Args:
+            data (list): Trace dicts
+            layout (dict): Layout dict
+            
+        Returns:
+            plotly.graph_objects.Figure: Figure
+        """
+        return go.Figure({'data': data, 'layout': layout}, _validate=False)
+    
+    def _f32(self, s):
+        """
+        Series values as float32 for sending to the browser (ample at pixel resolution)
+        
+        Args:
+            s (pandas.Series): Values to plot
+            
+        Returns:
+            numpy.ndarray: float32 values
+        """
+        return s.to_numpy(dtype=np.float32, copy=False)
+    
+    def _epoch_ms(self, index):
+        """
+        Timestamps as epoch milliseconds, which serialize as one binary float64 block
+        instead of an ISO string per point (the axis must be typed 'date')
+        
+        Args:
+            index (pandas.Index): Trace x values
+            
+        Returns:
+            numpy.ndarray or pandas.Index: Epoch milliseconds, or index unchanged when it is
+            not a DatetimeIndex or the resampler (which needs real timestamps) is active
+        """
+        if self._resample or not isinstance(index, pd.DatetimeIndex):
+            return index
+        return index.values.astype('datetime64[ms]').astype(np.float64)
+    
+    def _shared_x(self, index):
+        """
+        Compact x arguments for the traces of one chart that share an index
+        
+        Evenly spaced series are sent as x0 + dx (two scalars per trace), others as
+        epoch milliseconds.
+        
+        Args:
+            index (pandas.Index): Index shared by the chart's traces
+            
+        Returns:
+            dict: Trace keyword arguments, either x or x0 and dx
+        """
+        x = self._epoch_ms(index)
+        if isinstance(x, np.ndarray) and len(x) > 1:
+            step = np.diff(x)
+            if (step == step[0]).all():
+                return {'x0': float(x[0]), 'dx': float(step[0])}
+        return {'x': x}
+    
+    def _m4_ohlc(self, df, width_px=MAX_POINTS):
+        """
+        Pre-aggregate candles into at most width_px equal-count buckets (M4 style)
+        
+        Candlesticks are not downsampled by plotly-resampler, so long histories are
+        reduced here: first open, max high, min low and last close per bucket.
+        
+        Args:
+            df (pandas.DataFrame): OHLC data
+            width_px (int): Maximum number of candles to keep, about one per pixel
+            
+        Returns:
+            pandas.DataFrame: Aggregated OHLC data indexed by each bucket's first timestamp
+        """
+        n = len(df)
+        if n <= width_px:
+            return df
+        
+        # With n > width_px the edges are strictly increasing, so no bucket is empty
+        edges = np.linspace(0, n, width_px + 1, dtype=np.int64)
+        starts = edges[:-1]
+        
+        return pd.DataFrame(
+            {
+                'open': df['open'].to_numpy()[starts],
+                'high': np.fmax.reduceat(df['high'].to_numpy(), starts),
+                'low': np.fmin.reduceat(df['low'].to_numpy(), starts),
+                'close': df['close'].to_numpy()[edges[1:] - 1]
+            },
+            index=df.index[starts]
+        )
+    
+    def to_json_fast(self, fig):
+        """
+        Serialize a figure to JSON with orjson, skipping Plotly's validating encoder
+        
+        For callers that ship figure JSON themselves; st.plotly_chart does its own
+        serialization, so the Streamlit app does not use this.
+        
+        Args:
+            fig (plotly.graph_objects.Figure): Figure to serialize
+            
+        Returns:
+            bytes: Figure JSON
+        """
+        return orjson.dumps(
+            fig.to_dict(),
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    
+    def _percent_delta(self, value, percentage):
+        """
+        Build an Indicator delta that displays the given percentage change
+        
+        Args:
+            value (float): Displayed value
+            percentage (float): Change to show, in percent
+            
+        Returns:
+            dict: Plotly indicator delta spec, or None when the change is unknown or
+            not representable (at or below -100%)
+        """
+        if percentage is None or pd.isna(percentage) or percentage <= -100:
+            return None
+        return {
+            'reference': value / (1 + percentage / 100),
+            'relative': True,
+            'valueformat': '.2%'
+        }
+    
+    def _metric(self, title, value, number, percentage=None):
+        """
+        Indicator for one key metric
+        
+        Args:
+            title (str): Metric title
+            value (float): Metric value (None when the API has none)
+            number (dict): Plotly indicator number format
+            percentage (float): 24h change in percent, shown as a delta when usable
+            
+        Returns:
+            dict: Indicator trace
+        """
+        if value is None or pd.isna(value):
+            # Indicators cannot show text, so hide the number and print N/A under the title
+            return self._mk(
+                'indicator',
+                mode='number',
+                value=0,
+                number={'font': {'color': 'rgba(0,0,0,0)'}},
+                title={'text': f"{title}<br><span style='font-size:2em'>N/A</span>"}
+            )
+        
+        delta = self._percent_delta(value, percentage)
+        if delta is None:
+            return self._mk('indicator', mode='number', value=value, number=number, title={'text': title})
+        return self._mk('indicator', mode='number+delta', value=value, number=number, delta=delta,
+                        title={'text': title})
+    
+    def create_key_metrics_chart(self, metrics):
+        """
+        Create the key market metrics as a single figure of indicators
+        
+        Args:
+            metrics (dict): Current price and market data from DataFetcher
+            
+        Returns:
+            plotly.graph_objects.Figure: 2x4 grid of metric indicators
+        """
+        fig = _subplots(
+            rows=2, cols=4,
+            specs=[[{'type': 'indicator'}] * 4] * 2
+        )
+        fig._validate = False
+        
+        usd = {'prefix': '$', 'valueformat': ',.2f'}
+        usd_whole = {'prefix': '$', 'valueformat': ',.0f'}
+        btc = {'suffix': ' BTC', 'valueformat': ',.0f'}
+        
+        price, ath, low = metrics.get('current_price'), metrics.get('ath'), metrics.get('low_24h')
+        ath_change = (price - ath) / ath * 100 if price is not None and ath else None
+        low_text = f"${low:,.2f}" if low is not None else "N/A"
+        
+        indicators = [
+            self._metric('Current Price', price, usd, metrics.get('price_change_percentage_24h')),
+            self._metric('Market Cap', metrics.get('market_cap'), usd_whole,
+                         metrics.get('market_cap_change_percentage_24h')),
+            self._metric('24h Volume', metrics.get('total_volume'), usd_whole),
+            self._metric(f"24h High<br><sub>Low: {low_text}</sub>", metrics.get('high_24h'), usd),
+            self._metric('Circulating Supply', metrics.get('circulating_supply'), btc),
+            self._metric('Total Supply', metrics.get('total_supply') or 21000000, btc),
+            self._metric('Market Cap Rank', metrics.get('market_cap_rank'), {'prefix': '#'}),
+            self._metric('All-Time High', ath, usd, ath_change)
+        ]
+        
+        fig.add_traces(
+            indicators,
+            rows=[i // 4 + 1 for i in range(len(indicators))],
+            cols=[i % 4 + 1 for i in range(len(indicators))]
+        )
+        
+        fig.update_layout(
+            height=320,
+            margin=dict(l=20, r=20, t=40, b=20)
+        )
+        
+        return fig
     
     def create_price_chart(self, df, selected_indicators=None):
         """
@@ -29,139 +350,105 @@ class ChartVisualizer:
         Returns:
             plotly.graph_objects.Figure: Interactive price chart
         """
-        fig = make_subplots(
+        fig = _subplots(
             rows=1, cols=1,
             shared_xaxes=True,
             vertical_spacing=0.1,
             subplot_titles=('Bitcoin Price Chart',),
             row_width=[1.0]
         )
+        fig._validate = False
         
-        # Add candlestick chart
-        fig.add_trace(
-            go.Candlestick(
-                x=df.index,
-                open=df['open'],
-                high=df['high'],
-                low=df['low'],
-                close=df['close'],
+        # Collect every trace first and add them in one call
+        candles = self._m4_ohlc(df)
+        x = self._shared_x(df.index)
+        traces = [
+            self._mk(
+                'candlestick',
+                x=self._epoch_ms(candles.index),
+                open=self._f32(candles['open']),
+                high=self._f32(candles['high']),
+                low=self._f32(candles['low']),
+                close=self._f32(candles['close']),
                 name='Price',
-                increasing_line_color='#26a69a',
-                decreasing_line_color='#ef5350'
-            ),
-            row=1, col=1
-        )
+                increasing=dict(line=dict(color='#26a69a')),
+                decreasing=dict(line=dict(color='#ef5350'))
+            )
+        ]
         
         # Add technical indicators
         if selected_indicators:
-            # Moving averages
-            if 'SMA_20' in selected_indicators and 'SMA_20' in df.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['SMA_20'],
-                        mode='lines',
-                        name='SMA 20',
-                        line=dict(color='blue', width=2)
-                    ),
-                    row=1, col=1
-                )
+            moving_averages = [
+                ('SMA_20', 'SMA 20', dict(color='blue', width=2)),
+                ('SMA_50', 'SMA 50', dict(color='red', width=2)),
+                ('EMA_12', 'EMA 12', dict(color='purple', width=2, dash='dash')),
+                ('EMA_26', 'EMA 26', dict(color='orange', width=2, dash='dash'))
+            ]
+            bollinger = ['BB_Upper', 'BB_Middle', 'BB_Lower']
             
-            if 'SMA_50' in selected_indicators and 'SMA_50' in df.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['SMA_50'],
-                        mode='lines',
-                        name='SMA 50',
-                        line=dict(color='red', width=2)
-                    ),
-                    row=1, col=1
-                )
-            
-            if 'EMA_12' in selected_indicators and 'EMA_12' in df.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['EMA_12'],
-                        mode='lines',
-                        name='EMA 12',
-                        line=dict(color='purple', width=2, dash='dash')
-                    ),
-                    row=1, col=1
-                )
+            # Look the columns up once and materialize each plotted one as float32
+            colset = set(df.columns)
+            selected = set(selected_indicators)
+            needed = [col for col, _, _ in moving_averages if col in selected]
+            if 'Bollinger_Bands' in selected:
+                needed += bollinger
+            arrs = {col: self._f32(df[col]) for col in needed if col in colset}
             
-            if 'EMA_26' in selected_indicators and 'EMA_26' in df.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['EMA_26'],
-                        mode='lines',
-                        name='EMA 26',
-                        line=dict(color='orange', width=2, dash='dash')
-                    ),
-                    row=1, col=1
-                )
+            # Moving averages
+            for col, name, line in moving_averages:
+                if col in arrs:
+                    traces.append(self._mk('scattergl', **x, y=arrs[col], mode='lines', name=name, line=line))
             
             # Bollinger Bands
-            if 'Bollinger_Bands' in selected_indicators and all(col in df.columns for col in ['BB_Upper', 'BB_Middle', 'BB_Lower']):
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_Upper'],
-                        mode='lines',
-                        name='BB Upper',
-                        line=dict(color='gray', width=1),
-                        showlegend=False
-                    ),
-                    row=1, col=1
-                )
-                
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_Lower'],
+            if 'Bollinger_Bands' in selected and all(col in arrs for col in bollinger):
+                upper, lower = arrs['BB_Upper'], arrs['BB_Lower']
+                keep = np.flatnonzero(~(np.isnan(upper) | np.isnan(lower)))
+                if self._resample:
+                    # The envelope runs forward then back along x, which the resampler cannot
+                    # aggregate, so thin it below the resampling threshold instead
+                    keep = keep[::max(1, -(-len(keep) // (MAX_POINTS // 2)))]
+                xs = np.asarray(self._epoch_ms(df.index[keep]))
+                traces += [
+                    self._mk(
+                        'scattergl',
+                        x=np.concatenate([xs, xs[::-1]]),
+                        y=np.concatenate([upper[keep], lower[keep][::-1]]),
                         mode='lines',
                         name='Bollinger Bands',
                         line=dict(color='gray', width=1),
-                        fill='tonexty',
-                        fillcolor='rgba(128,128,128,0.1)'
+                        fill='toself',
+                        fillcolor='rgba(128,128,128,0.1)',
+                        hoverinfo='skip'
                     ),
-                    row=1, col=1
-                )
-                
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_Middle'],
+                    self._mk(
+                        'scattergl',
+                        **x,
+                        y=arrs['BB_Middle'],
                         mode='lines',
                         name='BB Middle',
                         line=dict(color='gray', width=2),
                         showlegend=False
-                    ),
-                    row=1, col=1
-                )
+                    )
+                ]
         
-        # Update layout
+        fig.add_traces(traces)
+        
+        # Update layout and axes
+        grid = dict(showgrid=True, gridwidth=1, gridcolor='rgba(128,128,128,0.2)')
         fig.update_layout(
             title={
                 'text': 'Bitcoin Price Analysis with Technical Indicators',
                 'x': 0.5,
                 'xanchor': 'center'
             },
-            xaxis_title='Date',
-            yaxis_title='Price (USD)',
+            xaxis=dict(title=dict(text='Date'), rangeslider=dict(visible=False), type='date', **grid),
+            yaxis=dict(title=dict(text='Price (USD)'), **grid),
             height=600,
             showlegend=True,
-            hovermode='x unified',
-            xaxis_rangeslider_visible=False
+            hovermode='x unified'
         )
         
-        # Update axes
-        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='rgba(128,128,128,0.2)')
-        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='rgba(128,128,128,0.2)')
-        
-        return fig
+        return self._resampled(fig)
     
     def create_rsi_chart(self, df):
         """
@@ -173,38 +460,60 @@ class ChartVisualizer:
         Returns:
             plotly.graph_objects.Figure: RSI chart
         """
-        fig = go.Figure()
+        traces = []
+        shapes = []
+        annotations = []
         
         if 'RSI' in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['RSI'],
+            rsi = self._f32(df['RSI'])
+            traces.append(
+                self._mk(
+                    'scattergl',
+                    **self._shared_x(df.index),
+                    y=rsi,
                     mode='lines',
                     name='RSI',
                     line=dict(color='purple', width=2)
                 )
             )
             
-            # Add overbought and oversold lines
-            fig.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought (70)")
-            fig.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold (30)")
-            fig.add_hline(y=50, line_dash="dot", line_color="gray", annotation_text="Neutral (50)")
+            # Overbought, oversold and neutral levels
+            for level, dash, color, text in (
+                (70, 'dash', 'red', 'Overbought (70)'),
+                (30, 'dash', 'green', 'Oversold (30)'),
+                (50, 'dot', 'gray', 'Neutral (50)')
+            ):
+                shapes.append(dict(
+                    type='line', xref='x domain', yref='y', x0=0, x1=1, y0=level, y1=level,
+                    line=dict(color=color, dash=dash)
+                ))
+                annotations.append(dict(
+                    xref='x domain', yref='y', x=1, y=level, text=text,
+                    showarrow=False, xanchor='right', yanchor='bottom'
+                ))
             
-            # Add colored background for zones
-            fig.add_hrect(y0=70, y1=100, fillcolor="red", opacity=0.1, layer="below", line_width=0)
-            fig.add_hrect(y0=0, y1=30, fillcolor="green", opacity=0.1, layer="below", line_width=0)
+            # Shade the periods RSI spent in the overbought/oversold zones
+            starts, ends, zones = _zone_runs(rsi, 30.0, 70.0)
+            last = len(df.index) - 1
+            for start, end, zone in zip(starts, ends, zones):
+                shapes.append(dict(
+                    type='rect', xref='x', yref='y domain', y0=0, y1=1,
+                    x0=df.index[start], x1=df.index[min(end + 1, last)],
+                    fillcolor="red" if zone > 0 else "green", opacity=0.1, layer="below", line=dict(width=0)
+                ))
         
-        fig.update_layout(
-            title='RSI (Relative Strength Index)',
-            xaxis_title='Date',
-            yaxis_title='RSI',
+        # All level lines, labels and zone shading go in with the layout
+        fig = self._figure(traces, dict(
+            title=dict(text='RSI (Relative Strength Index)'),
+            xaxis=dict(title=dict(text='Date'), type='date'),
+            yaxis=dict(title=dict(text='RSI'), range=[0, 100], fixedrange=True),
             height=300,
-            yaxis=dict(range=[0, 100]),
+            shapes=shapes,
+            annotations=annotations,
             showlegend=False
-        )
+        ))
         
-        return fig
+        return self._resampled(fig)
     
     def create_macd_chart(self, df):
         """
@@ -216,55 +525,66 @@ class ChartVisualizer:
         Returns:
             plotly.graph_objects.Figure: MACD chart
         """
-        fig = go.Figure()
+        traces = []
+        shapes = []
         
-        if all(col in df.columns for col in ['MACD', 'MACD_Signal', 'MACD_Histogram']):
-            # MACD line
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['MACD'],
+        # Look the columns up once and materialize each plotted one as float32
+        colset = set(df.columns)
+        macd_cols = ['MACD', 'MACD_Signal', 'MACD_Histogram']
+        
+        if all(col in colset for col in macd_cols):
+            x = self._shared_x(df.index)
+            arrs = {col: self._f32(df[col]) for col in macd_cols}
+            
+            # Histogram, colored in the browser from a compact +1/-1 sign array
+            hist = arrs['MACD_Histogram']
+            sign = np.where(hist >= 0, 1, -1).astype(np.int8)
+            
+            traces += [
+                # MACD line
+                self._mk(
+                    'scattergl',
+                    **x,
+                    y=arrs['MACD'],
                     mode='lines',
                     name='MACD',
                     line=dict(color='blue', width=2)
-                )
-            )
-            
-            # Signal line
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['MACD_Signal'],
+                ),
+                # Signal line
+                self._mk(
+                    'scattergl',
+                    **x,
+                    y=arrs['MACD_Signal'],
                     mode='lines',
                     name='Signal',
                     line=dict(color='red', width=2)
-                )
-            )
-            
-            # Histogram
-            colors = ['green' if val >= 0 else 'red' for val in df['MACD_Histogram']]
-            fig.add_trace(
-                go.Bar(
-                    x=df.index,
-                    y=df['MACD_Histogram'],
+                ),
+                self._mk(
+                    'bar',
+                    **x,
+                    y=hist,
                     name='Histogram',
-                    marker_color=colors,
+                    marker=dict(color=sign, colorscale=[[0, 'red'], [1, 'green']], cmin=-1, cmax=1),
                     opacity=0.6
                 )
-            )
+            ]
             
             # Zero line
-            fig.add_hline(y=0, line_dash="dash", line_color="gray")
+            shapes.append(dict(
+                type='line', xref='x domain', yref='y', x0=0, x1=1, y0=0, y1=0,
+                line=dict(color='gray', dash='dash')
+            ))
         
-        fig.update_layout(
-            title='MACD (Moving Average Convergence Divergence)',
-            xaxis_title='Date',
-            yaxis_title='MACD',
+        fig = self._figure(traces, dict(
+            title=dict(text='MACD (Moving Average Convergence Divergence)'),
+            xaxis=dict(title=dict(text='Date'), type='date'),
+            yaxis=dict(title=dict(text='MACD')),
             height=300,
+            shapes=shapes,
             showlegend=True
-        )
+        ))
         
-        return fig
+        return self._resampled(fig)
     
     def create_volume_chart(self, df):
         """
@@ -276,36 +596,31 @@ class ChartVisualizer:
         Returns:
             plotly.graph_objects.Figure: Volume chart
         """
-        fig = go.Figure()
+        traces = []
         
         if 'volume' in df.columns:
-            # Color bars based on price change
-            colors = []
-            for i in range(len(df)):
-                if i == 0:
-                    colors.append('gray')
-                else:
-                    if df['close'].iloc[i] >= df['close'].iloc[i-1]:
-                        colors.append('green')
-                    else:
-                        colors.append('red')
+            # Color bars based on price change (the first bar has no previous close)
+            close = df['close'].to_numpy()
+            colors = np.full(len(close), 'gray', dtype=object)
+            colors[1:] = np.where(close[1:] >= close[:-1], 'green', 'red')
             
-            fig.add_trace(
-                go.Bar(
+            traces.append(
+                self._mk(
+                    'bar',
                     x=df.index,
-                    y=df['volume'],
+                    y=self._f32(df['volume']),
                     name='Volume',
-                    marker_color=colors
+                    marker=dict(color=colors)
                 )
             )
         
-        fig.update_layout(
-            title='Trading Volume',
-            xaxis_title='Date',
-            yaxis_title='Volume',
+        fig = self._figure(traces, dict(
+            title=dict(text='Trading Volume'),
+            xaxis=dict(title=dict(text='Date')),
+            yaxis=dict(title=dict(text='Volume')),
             height=200,
             showlegend=False
-        )
+        ))
         
         return fig
     
@@ -319,18 +634,28 @@ class ChartVisualizer:
         Returns:
             plotly.graph_objects.Figure: Correlation heatmap
         """
-        fig = px.imshow(
-            correlation_matrix,
-            text_auto=True,
-            aspect="auto",
-            color_continuous_scale="RdBu_r",
-            title="Cryptocurrency Price Correlation Matrix"
+        z = correlation_matrix.to_numpy(dtype=np.float32)
+        
+        # Cell labels only while they stay readable; they are formatted from z in the
+        # browser, so no separate text matrix is sent
+        show_text = z.shape[0] <= 20
+        heatmap = self._mk(
+            'heatmap',
+            z=z,
+            x=correlation_matrix.columns,
+            y=correlation_matrix.index,
+            colorscale=get_colorscale('RdBu_r'),
+            zmin=-1,
+            zmax=1
         )
+        if show_text:
+            heatmap['texttemplate'] = '%{z:.2f}'
         
-        fig.update_layout(
+        fig = self._figure([heatmap], dict(
+            title=dict(text="Cryptocurrency Price Correlation Matrix", x=0.5),
             height=400,
-            title_x=0.5
-        )
+            yaxis=dict(autorange='reversed')
+        ))
         
         return fig
     
@@ -344,67 +669,151 @@ class ChartVisualizer:
         Returns:
             plotly.graph_objects.Figure: Comparison chart
         """
-        fig = go.Figure()
-        
         colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
         
-        for i, (crypto, data) in enumerate(comparison_data.items()):
-            if data is not None and len(data) > 0:
-                # Normalize to percentage change from first value
-                normalized = ((data['price'] / data['price'].iloc[0]) - 1) * 100
-                
-                fig.add_trace(
-                    go.Scatter(
-                        x=data.index,
-                        y=normalized,
-                        mode='lines',
-                        name=crypto.title(),
-                        line=dict(color=colors[i % len(colors)], width=2)
-                    )
-                )
+        # Normalize to percentage change from first value: one float32 broadcast
+        # when the series line up, otherwise one NumPy pass per series
+        items = [(crypto, data) for crypto, data in comparison_data.items() if data is not None and len(data)]
+        prices = {crypto: data['price'].to_numpy(dtype=np.float32) for crypto, data in items}
+        if len({len(p) for p in prices.values()}) == 1:
+            stacked = np.column_stack(list(prices.values()))
+            normalized = (stacked / stacked[0] - 1.0) * 100.0
+            normalized = dict(zip(prices, normalized.T))
+        else:
+            normalized = {crypto: (p / p[0] - 1.0) * 100.0 for crypto, p in prices.items()}
         
-        fig.update_layout(
-            title='Normalized Price Comparison (% Change)',
-            xaxis_title='Date',
-            yaxis_title='Percentage Change (%)',
+        color_cycle = colors * (len(items) // len(colors) + 1)
+        traces = [
+            self._mk(
+                'scattergl',
+                x=data.index,
+                y=normalized[crypto],
+                mode='lines',
+                name=crypto.title(),
+                line=dict(color=color, width=2)
+            )
+            for (crypto, data), color in zip(items, color_cycle)
+        ]
+        
+        fig = self._figure(traces, dict(
+            title=dict(text='Normalized Price Comparison (% Change)'),
+            xaxis=dict(title=dict(text='Date')),
+            yaxis=dict(title=dict(text='Percentage Change (%)')),
             height=500,
             hovermode='x unified'
-        )
+        ))
+        
+        return self._resampled(fig)
+    
+    def update_series(self, fig, crypto, data):
+        """
+        Replace one series of a comparison chart instead of rebuilding the whole figure
+        
+        For callers that keep a live figure between updates (a FigureWidget, or a
+        Dash callback returning the figure); the Streamlit app rebuilds its charts
+        on every rerun and does not use this.
+        
+        Args:
+            fig (plotly.graph_objects.Figure): Chart from create_comparison_chart
+            crypto (str): Cryptocurrency whose data changed
+            data (pandas.DataFrame): New data for it, with a 'price' column
+            
+        Returns:
+            plotly.graph_objects.Figure: The same figure, updated
+        """
+        price = data['price'].to_numpy(dtype=np.float32)
+        normalized = (price / price[0] - 1.0) * 100.0
+        name = crypto.title()
+        
+        trace = next((t for t in fig.data if t.name == name), None)
+        if trace is not None and not self._resample:
+            # Only y changes unless the series was resized
+            with fig.batch_update():
+                if len(trace.y) != len(normalized):
+                    trace.x = data.index
+                trace.y = normalized
+            return fig
         
+        # The resampler keeps its own full-resolution copy, so hand it a new trace
+        line = dict(width=2) if trace is None else trace.line
+        fig.data = [t for t in fig.data if t.name != name]
+        fig.add_trace(self._mk('scattergl', x=data.index, y=normalized, mode='lines', name=name, line=line))
         return fig
     
-    def create_metrics_gauge(self, current_value, min_value, max_value, title):
+    def _gauge(self, current_value, min_value, max_value, title):
         """
-        Create gauge chart for metrics
+        Gauge indicator trace spec shared by the single and batched gauge charts
         
         Args:
             current_value (float): Current value
             min_value (float): Minimum value for scale
             max_value (float): Maximum value for scale
-            title (str): Chart title
+            title (str): Gauge title
             
         Returns:
-            plotly.graph_objects.Figure: Gauge chart
+            dict: Indicator trace
         """
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = current_value,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': title},
-            gauge = {
+        span = max_value - min_value
+        s1 = min_value + span * 0.33
+        s2 = min_value + span * 0.66
+        thr = max_value * 0.9
+        return self._mk(
+            'indicator',
+            mode="gauge+number+delta",
+            value=current_value,
+            title={'text': title},
+            gauge={
                 'axis': {'range': [min_value, max_value]},
                 'bar': {'color': "darkblue"},
                 'steps': [
-                    {'range': [min_value, min_value + (max_value - min_value) * 0.33], 'color': "lightgray"},
-                    {'range': [min_value + (max_value - min_value) * 0.33, min_value + (max_value - min_value) * 0.66], 'color': "gray"}
+                    {'range': [min_value, s1], 'color': "lightgray"},
+                    {'range': [s1, s2], 'color': "gray"}
                 ],
                 'threshold': {
                     'line': {'color': "red", 'width': 4},
                     'thickness': 0.75,
-                    'value': max_value * 0.9
+                    'value': thr
                 }
             }
-        ))
+        )
+    
+    def create_metrics_gauge(self, current_value, min_value, max_value, title):
+        """
+        Create gauge chart for metrics
+        
+        Args:
+            current_value (float): Current value
+            min_value (float): Minimum value for scale
+            max_value (float): Maximum value for scale
+            title (str): Chart title
+            
+        Returns:
+            plotly.graph_objects.Figure: Gauge chart
+        """
+        gauge = self._gauge(current_value, min_value, max_value, title)
+        gauge['domain'] = {'x': [0, 1], 'y': [0, 1]}
+        fig = self._figure([gauge], dict(height=300))
+        
+        return fig
+    
+    def create_metrics_gauges(self, gauges):
+        """
+        Create several gauges side by side in one figure
+        
+        Args:
+            gauges (list): (current_value, min_value, max_value, title) tuples
+            
+        Returns:
+            plotly.graph_objects.Figure: Row of gauge charts
+        """
+        n = len(gauges)
+        fig = _subplots(rows=1, cols=n, specs=[[{'type': 'indicator'}] * n])
+        fig._validate = False
+        fig.add_traces(
+            [self._gauge(*gauge) for gauge in gauges],
+            rows=[1] * n,
+            cols=list(range(1, n + 1))
+        )
         
         fig.update_layout(height=300)
         